@@ -44,7 +44,8 @@ class MyMapBokeh(Gdf2Bokeh):
 
     def __slider_update(self, attrname, old_value, new_value) -> None:
         input_data_filtered = self._layer["data"].loc[self._layer["data"]["value"] == new_value]
-        self._bokeh_layer.data = input_data_filtered
+        # the slider fires while dragging: only the latest value is applied every 100ms
+        self._bokeh_layer.schedule_data(input_data_filtered, interval=100)
 
     def _map_layout(self) -> None:
         layout = column(
@@ -1,2 +1,30 @@
-from gdf2bokeh.main import Gdf2Bokeh
-from gdf2bokeh.layer import LayerCore
\ No newline at end of file
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from gdf2bokeh.main import Gdf2Bokeh
+    from gdf2bokeh.layer import LayerCore
+    from gdf2bokeh.budget import LayerBudget
+
+__all__ = ["Gdf2Bokeh", "LayerCore", "LayerBudget"]
+
+# the public classes are imported on first access: importing the package does not load geopandas and bokeh
+_LAZY_IMPORTS = {
+    "Gdf2Bokeh": "gdf2bokeh.main",
+    "LayerCore": "gdf2bokeh.layer",
+    "LayerBudget": "gdf2bokeh.budget",
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
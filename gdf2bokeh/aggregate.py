@@ -0,0 +1,100 @@
+from typing import Any
+from typing import Dict
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from bokeh.plotting import figure
+from bokeh.transform import linear_cmap
+from bokeh.util.hex import cartesian_to_axial
+
+from gdf2bokeh.layer import LayerCore
+from gdf2bokeh.models import BinShape
+
+
+class AggregatedLayer(LayerCore):
+    """
+    A layer displaying the features density: the points (or the centroids of the lines and polygons) are binned on
+    hexagons or squares and the attributes are aggregated by cell. The cells are colored from the `color_by` column,
+    default: the first aggregated column, else the features count ('count' column).
+    """
+    _SELECTABLE: bool = False
+    _BUDGETED: bool = False
+
+    def __init__(self, title: str, data: gpd.GeoDataFrame, from_epsg: int, cell_size: float,
+                 agg: Dict[str, str] | None = None, shape: str = BinShape.HEX, color_by: str | None = None,
+                 palette: str = "Viridis256", **style_parameters) -> None:
+        """
+        :param cell_size: cell size (map units, EPSG:3857): hexagon radius or square width
+        :type cell_size: float
+        :param agg: aggregation functions (pandas) by column, ex: {"value": "sum"}
+        :type agg: dict
+        :param shape: cells shape (hex, square)
+        :type shape: str
+        :param color_by: column coloring the cells
+        :type color_by: str
+        :param palette: bokeh palette name used to color the cells
+        :type palette: str
+        """
+        self._cell_size = cell_size
+        self._agg = agg or {}
+        self._shape = BinShape(shape)
+        self._color_by = color_by or next(iter(self._agg), "count")
+        if self._shape == BinShape.HEX:
+            self._TOOLTIP_EXCLUDED_COLUMNS = ["q", "r"]
+        else:
+            self._TOOLTIP_EXCLUDED_COLUMNS = ["x", "y", "left", "right", "bottom", "top"]
+        super().__init__(title=title, data=data, from_epsg=from_epsg, palette=palette, **style_parameters)
+
+    def _to_data_source_data(self, data: gpd.GeoDataFrame, derived: Dict[str, Any]) -> Dict[str, list]:
+        geometries = data.geometry.values
+        # points are binned as they are (multipoints are exploded), others from their centroid
+        is_multipoint = shapely.get_type_id(geometries) == shapely.GeometryType.MULTIPOINT
+        if is_multipoint.any():
+            data = data.explode(index_parts=False)
+            geometries = data.geometry.values
+        # the features without geometry are not binned
+        is_located = ~(shapely.is_missing(geometries) | shapely.is_empty(geometries))
+        if not is_located.all():
+            data, geometries = data.loc[is_located], geometries[is_located]
+        coordinates = shapely.get_coordinates(shapely.centroid(geometries))
+        attributes = pd.DataFrame({column: data[column].to_numpy() for column in self._agg})
+
+        if self._shape == BinShape.HEX:
+            cells = ["q", "r"]
+            attributes["q"], attributes["r"] = cartesian_to_axial(
+                coordinates[:, 0], coordinates[:, 1], self._cell_size, "pointytop"
+            )
+        else:
+            cells = ["x", "y"]
+            attributes["x"] = np.floor(coordinates[:, 0] / self._cell_size).astype(np.int64)
+            attributes["y"] = np.floor(coordinates[:, 1] / self._cell_size).astype(np.int64)
+
+        attributes["count"] = 1
+        aggregated = attributes.groupby(cells).agg({**self._agg, "count": "count"}).reset_index()
+        if self._shape == BinShape.SQUARE:
+            aggregated["left"] = aggregated["x"] * self._cell_size
+            aggregated["right"] = aggregated["left"] + self._cell_size
+            aggregated["bottom"] = aggregated["y"] * self._cell_size
+            aggregated["top"] = aggregated["bottom"] + self._cell_size
+
+        return {column: aggregated[column].to_numpy() for column in aggregated.columns}
+
+    def render(self, figure_obj: figure) -> None:
+        """render the bokeh object"""
+        self._before_render()
+        # low/high are computed by the color mapper from the data, following the data updates
+        fill_color = linear_cmap(self._color_by, self._palette, low=None, high=None)
+        if self._shape == BinShape.HEX:
+            render = figure_obj.hex_tile(
+                q="q", r="r", size=self._cell_size, orientation="pointytop", source=self._data_source,
+                fill_color=fill_color, legend_label=self.legend_label, **self._style_parameters
+            )
+        else:
+            render = figure_obj.quad(
+                left="left", right="right", bottom="bottom", top="top", source=self._data_source,
+                fill_color=fill_color, legend_label=self.legend_label, **self._style_parameters
+            )
+        self._set_tooltip(figure_obj, render)
@@ -0,0 +1,218 @@
+import json
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+import numpy as np
+import pyarrow as pa
+import shapely
+from pyproj import CRS
+from pyproj import Transformer
+
+from bokeh.plotting import figure
+
+from gdf2bokeh.budget import LayerStats
+from gdf2bokeh.geometry import ragged_2_bokeh_format
+from gdf2bokeh.projection import WGS84_EPSG
+from gdf2bokeh.projection import lonlat_to_web_mercator
+from gdf2bokeh.layer import GeomTypes
+from gdf2bokeh.layer import LayerCore
+
+# nesting depth of the native geoarrow encodings
+GEOARROW_DEPTH: Dict[str, int] = {
+    "geoarrow.point": 0,
+    "geoarrow.linestring": 1,
+    "geoarrow.multipoint": 1,
+    "geoarrow.polygon": 2,
+    "geoarrow.multilinestring": 2,
+    "geoarrow.multipolygon": 3,
+}
+GEOARROW_GEOM_TYPE: Dict[str, GeomTypes] = {
+    "geoarrow.point": GeomTypes.POINT,
+    "geoarrow.linestring": GeomTypes.LINESTRINGS,
+    "geoarrow.multipoint": GeomTypes.MULTIPOINT,
+    "geoarrow.polygon": GeomTypes.POLYGONS,
+    "geoarrow.multilinestring": GeomTypes.LINESTRINGS,
+    "geoarrow.multipolygon": GeomTypes.POLYGONS,
+}
+
+
+class ArrowGeometryError(Exception):
+    pass
+
+
+def get_geoarrow_encoding(field: pa.Field) -> str:
+    """
+    get_geoarrow_encoding
+
+    To get the geoarrow encoding of a field (geoarrow.point, geoarrow.wkb...), from its extension type or from its
+    extension metadata
+
+    :type field: pa.Field
+
+    :return: str
+    """
+    if isinstance(field.type, pa.ExtensionType):
+        return field.type.extension_name
+    encoding = (field.metadata or {}).get(b"ARROW:extension:name")
+    if encoding is not None:
+        return encoding.decode()
+    if pa.types.is_binary(field.type) or pa.types.is_large_binary(field.type):
+        return "geoarrow.wkb"
+    if pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+        return "geoarrow.wkt"
+    raise ArrowGeometryError(f"{field.name} geometry encoding not found")
+
+
+def get_geoarrow_crs(field: pa.Field) -> CRS | None:
+    """To get the CRS of a geoarrow field, from its extension metadata"""
+    if isinstance(field.type, pa.ExtensionType):
+        metadata = field.type.__arrow_ext_serialize__()
+    else:
+        metadata = (field.metadata or {}).get(b"ARROW:extension:metadata")
+    crs = json.loads(metadata or b"{}").get("crs")
+    if crs is None:
+        return None
+    return CRS.from_user_input(crs)
+
+
+def read_geoarrow_buffers(array: pa.Array | pa.ChunkedArray, encoding: str
+                          ) -> Tuple[np.ndarray, np.ndarray, List[np.ndarray]]:
+    """
+    read_geoarrow_buffers
+
+    To read the coordinates and the offsets buffers of a native geoarrow array (interleaved or separated
+    coordinates), as NumPy views when possible (single chunk, without nulls)
+
+    :type array: pa.Array or pa.ChunkedArray
+    :type encoding: str, geoarrow.point, geoarrow.linestring...
+
+    :return: x, y and the offsets of each nesting level (geometries first)
+    """
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    if isinstance(array, pa.ExtensionArray):
+        array = array.storage
+    if array.null_count > 0:
+        raise ArrowGeometryError("null geometries are not supported")
+
+    offsets = []
+    for _ in range(GEOARROW_DEPTH[encoding]):
+        offsets.append(array.offsets.to_numpy())
+        array = array.values
+
+    if pa.types.is_struct(array.type):
+        # flatten accounts for the offset of a sliced array
+        coordinates = dict(zip([field.name for field in array.type], array.flatten()))
+        x = coordinates["x"].to_numpy()
+        y = coordinates["y"].to_numpy()
+    else:
+        # interleaved coordinates: xy, xyz...
+        dimensions = array.type.list_size
+        coordinates = array.flatten().to_numpy()
+        x = coordinates[0::dimensions]
+        y = coordinates[1::dimensions]
+    return x, y, offsets
+
+
+class ArrowLayer(LayerCore):
+    """
+    A layer built from a pyarrow Table whose geometry column uses a native geoarrow encoding: the coordinates and
+    offsets buffers are read directly into the data source columns, without building shapely geometries. Multi
+    line and multipoint features are exploded, as on the GeoDataFrame layers.
+    """
+    _DEFAULT_STYLE = "circle"
+
+    def __init__(self, title: str, data: pa.Table, from_epsg: int, geom_column: str = "geometry",
+                 **style_parameters) -> None:
+        """
+        :param data: the table, its geometry column must use a native geoarrow encoding
+        :type data: pa.Table
+        :param geom_column: the geometry column name
+        :type geom_column: str
+        """
+        self._geom_column = geom_column
+        self._encoding = get_geoarrow_encoding(data.schema.field(geom_column))
+        if self._encoding not in GEOARROW_DEPTH:
+            raise ArrowGeometryError(f"{self._encoding} is not a native geoarrow encoding")
+        self._geom_type = GEOARROW_GEOM_TYPE[self._encoding]
+        # multi lines and multipoints are exploded on the data source
+        self._SELECTABLE = self._encoding not in ("geoarrow.multipoint", "geoarrow.multilinestring")
+        if self._geom_type in (GeomTypes.POINT, GeomTypes.MULTIPOINT):
+            self._STYLE_BY_PROPERTIES = ("fill_color", "line_color")
+        elif self._geom_type == GeomTypes.LINESTRINGS:
+            self._STYLE_BY_PROPERTIES = ("line_color",)
+        # the CRS of the table is used when it is set, as GeoDataFrame.to_crs does
+        self._crs = get_geoarrow_crs(data.schema.field(geom_column)) or CRS.from_epsg(from_epsg)
+        super().__init__(title=title, data=data, from_epsg=from_epsg, **style_parameters)
+
+    def _prepare_data(self, data: pa.Table) -> Tuple[pa.Table, LayerStats, Dict[str, Any]]:
+        x, _, _ = read_geoarrow_buffers(data.column(self._geom_column), self._encoding)
+        attributes = data.drop_columns([self._geom_column])
+        stats = LayerStats(
+            features=data.num_rows,
+            vertices=x.shape[0],
+            coordinates_bytes=x.shape[0] * 2 * np.dtype(np.float64).itemsize,
+            attributes_bytes=attributes.nbytes,
+        )
+        if self._budget is not None:
+            self._budget.check(self.title, stats)
+        return data, stats, {}
+
+    def _geometries(self, data: pa.Table) -> np.ndarray:
+        x, y, offsets = read_geoarrow_buffers(data.column(self._geom_column), self._encoding)
+        x, y = self._project(x, y)
+        geometry_type = shapely.GeometryType[self._encoding.split(".")[1].upper()]
+        return shapely.from_ragged_array(
+            geometry_type, np.column_stack([x, y]), tuple(reversed(offsets)) if len(offsets) > 0 else None
+        )
+
+    @staticmethod
+    def _take_rows(data: pa.Table, rows: np.ndarray) -> pa.Table:
+        return data.take(rows)
+
+    def _project(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        epsg = self._crs.to_epsg()
+        if epsg == self._DEFAULT_EPSG:
+            return x, y
+        if epsg == WGS84_EPSG:
+            return lonlat_to_web_mercator(x, y)
+        transformer = Transformer.from_crs(self._crs, self._DEFAULT_EPSG, always_xy=True)
+        return transformer.transform(x, y)
+
+    def _to_data_source_data(self, data: pa.Table, derived: Dict[str, Any]) -> Dict[str, list]:
+        x, y, offsets = read_geoarrow_buffers(data.column(self._geom_column), self._encoding)
+        x, y = self._project(x, y)
+
+        geometry_type = shapely.GeometryType[self._encoding.split(".")[1].upper()]
+        x_values, y_values, rows = ragged_2_bokeh_format(geometry_type, x, y, offsets)
+
+        attributes = data.drop_columns([self._geom_column])
+        if rows.shape[0] != data.num_rows:
+            attributes = attributes.take(rows)
+        return {
+            "x": x_values,
+            "y": y_values,
+            **{
+                column: attributes.column(column).to_numpy()
+                for column in attributes.column_names
+            },
+        }
+
+    def render(self, figure_obj: figure) -> None:
+        """render the bokeh object"""
+        self._before_render()
+        if self._geom_type in (GeomTypes.POINT, GeomTypes.MULTIPOINT):
+            render = getattr(figure_obj, self._DEFAULT_STYLE)(
+                x="x", y="y", source=self._data_source, **self._glyph_parameters()
+            )
+        elif self._geom_type == GeomTypes.LINESTRINGS:
+            render = figure_obj.multi_line(
+                xs="x", ys="y", source=self._data_source, **self._glyph_parameters()
+            )
+        else:
+            render = figure_obj.multi_polygons(
+                xs="x", ys="y", source=self._data_source, **self._glyph_parameters()
+            )
+        self._set_tooltip(figure_obj, render)
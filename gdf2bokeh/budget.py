@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import warnings
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import NamedTuple
+
+import numpy as np
+import shapely
+
+from gdf2bokeh.models import BudgetPolicy
+
+if TYPE_CHECKING:
+    import geopandas as gpd
+
+
+class LayerBudgetError(Exception):
+    pass
+
+
+class LayerStats(NamedTuple):
+    features: int
+    vertices: int
+    coordinates_bytes: int
+    attributes_bytes: int
+
+    @property
+    def estimated_bytes(self) -> int:
+        """estimated size of the bokeh ColumnDataSource"""
+        return self.coordinates_bytes + self.attributes_bytes
+
+
+class LayerBudget:
+    __SIMPLIFY_MAX_ITERATIONS: int = 16
+    __SIMPLIFY_DEFAULT_RATIO: float = 1e-4
+
+    def __init__(self, max_vertices: int | None = None, max_bytes: int | None = None,
+                 policy: str = BudgetPolicy.ERROR, simplify_tolerance: float | None = None) -> None:
+        """
+        :param max_vertices: maximum vertices count allowed on a layer
+        :type max_vertices: int
+        :param max_bytes: maximum estimated ColumnDataSource size (bytes) allowed on a layer
+        :type max_bytes: int
+        :param policy: what to do when a layer exceeds the budget (error, simplify, warn)
+        :type policy: str
+        :param simplify_tolerance: first tolerance (in map units) used by the simplify policy. It is doubled until
+            the layer fits in the budget. Default: a fraction of the layer extent
+        :type simplify_tolerance: float
+        """
+        self.max_vertices = max_vertices
+        self.max_bytes = max_bytes
+        self.policy = BudgetPolicy(policy)
+        self.simplify_tolerance = simplify_tolerance
+
+    def is_exceeded(self, stats: LayerStats) -> bool:
+        if self.max_vertices is not None and stats.vertices > self.max_vertices:
+            return True
+        if self.max_bytes is not None and stats.estimated_bytes > self.max_bytes:
+            return True
+        return False
+
+    def apply(self, title: str, data: gpd.GeoDataFrame,
+              simplify: Callable[[float], gpd.GeoDataFrame] | None = None) -> tuple[gpd.GeoDataFrame, LayerStats]:
+        """
+        Check the data against the budget and apply the fallback policy if needed
+
+        :param title: the layer title
+        :type title: str
+        :param data: the layer data
+        :type data: gpd.GeoDataFrame
+        :param simplify: the simplification of the data with a tolerance, used by the simplify policy. Default: each
+            geometry is simplified
+        :type simplify: callable
+
+        :return: the data, simplified if needed, and its stats
+        """
+        stats = compute_stats(data)
+        if not self.is_exceeded(stats):
+            return data, stats
+
+        # points cannot be simplified
+        if self.policy == BudgetPolicy.SIMPLIFY and shapely.get_dimensions(data.geometry.values).max() > 0:
+            data, stats = self._simplify(data, stats, simplify)
+
+        self.check(title, stats)
+        return data, stats
+
+    def check(self, title: str, stats: LayerStats) -> None:
+        """To raise (or warn with the warn policy) if the stats exceed the budget"""
+        if not self.is_exceeded(stats):
+            return
+
+        if self.policy == BudgetPolicy.WARN:
+            warnings.warn(f"Layer '{title}' exceeds its budget: {stats}")
+            return
+
+        raise LayerBudgetError(f"Layer '{title}' exceeds its budget: {stats}")
+
+    def _simplify(self, data: gpd.GeoDataFrame, stats: LayerStats,
+                  simplify: Callable[[float], gpd.GeoDataFrame] | None) -> tuple[gpd.GeoDataFrame, LayerStats]:
+        geometries = data.geometry.values
+        tolerance = self.simplify_tolerance
+        if tolerance is None:
+            x_min, y_min, x_max, y_max = shapely.total_bounds(geometries)
+            tolerance = np.hypot(x_max - x_min, y_max - y_min) * self.__SIMPLIFY_DEFAULT_RATIO
+        if simplify is None:
+            def simplify(simplify_tolerance: float) -> gpd.GeoDataFrame:
+                return data.set_geometry(
+                    shapely.simplify(geometries, simplify_tolerance, preserve_topology=True), crs=data.crs
+                )
+
+        simplified = data
+        for _ in range(self.__SIMPLIFY_MAX_ITERATIONS):
+            simplified = simplify(tolerance)
+            simplified_stats = compute_stats(simplified)
+            if not self.is_exceeded(simplified_stats):
+                return simplified, simplified_stats
+            stats = simplified_stats
+            tolerance *= 2
+
+        return simplified, stats
+
+
+def compute_stats(data: gpd.GeoDataFrame) -> LayerStats:
+    """
+    To estimate cheaply the vertices count and the bokeh ColumnDataSource size of a GeoDataFrame
+
+    Coordinates are counted as 2 float64 values per vertex.
+    """
+    vertices = int(shapely.get_num_coordinates(data.geometry.values).sum())
+    attributes = data.drop(columns=data.geometry.name)
+    return LayerStats(
+        features=data.shape[0],
+        vertices=vertices,
+        coordinates_bytes=vertices * 2 * np.dtype(np.float64).itemsize,
+        attributes_bytes=int(attributes.memory_usage(index=False, deep=True).sum()),
+    )
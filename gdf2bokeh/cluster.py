@@ -0,0 +1,186 @@
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from bokeh.plotting import figure
+
+from gdf2bokeh.layer import PointLayer
+from gdf2bokeh.tiles import ViewportLayer
+from gdf2bokeh.tiles import WEB_MERCATOR_EXTENT
+from gdf2bokeh.tiles import tile_resolution
+from gdf2bokeh.tiles import zoom_for_viewport
+
+
+class ClusterLevel:
+    """The clusters of a zoom level: their centroid, their points count and the row of their first point"""
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, count: np.ndarray, row: np.ndarray) -> None:
+        self.x = x
+        self.y = y
+        self.count = count
+        self.row = row
+
+
+class PointClusters:
+    """
+    A hierarchical grid clustering of projected points (EPSG:3857)
+
+    The grid cells of a zoom level are `radius` pixels wide and nested in the cells of the previous zoom level, so
+    each level is computed from the clusters of the next (finer) one.
+    """
+
+    def __init__(self, data: gpd.GeoDataFrame, min_zoom: int = 0, max_zoom: int = 16, radius: int = 40,
+                 tile_size: int = 256) -> None:
+        """
+        :param data: the points to cluster, projected on EPSG:3857
+        :type data: gpd.GeoDataFrame
+        :param min_zoom: first zoom level clustered
+        :type min_zoom: int
+        :param max_zoom: last zoom level clustered, the points are not clustered when zooming further
+        :type max_zoom: int
+        :param radius: cluster cell width (pixels)
+        :type radius: int
+        :param tile_size: tile size (pixels) used to compute the zoom levels
+        :type tile_size: int
+        """
+        self.data = data
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.tile_size = tile_size
+        self._radius = radius
+        self.levels: Dict[int, ClusterLevel] = {}
+
+        geometries = data.geometry.values
+        # the missing and empty points are not displayed: the rows of the others are kept
+        rows = np.flatnonzero(~(shapely.is_missing(geometries) | shapely.is_empty(geometries)))
+        coordinates = shapely.get_coordinates(geometries[rows])
+        self.points = ClusterLevel(
+            coordinates[:, 0], coordinates[:, 1], np.ones(coordinates.shape[0], dtype=np.int64), rows
+        )
+        self._build()
+
+    def _build(self) -> None:
+        level = self.points
+        for z in range(self.max_zoom, self.min_zoom - 1, -1):
+            cell_size = tile_resolution(z, self.tile_size) * self._radius
+            cells_count = int(np.ceil(2 * WEB_MERCATOR_EXTENT / cell_size))
+            cells_id = (
+                np.floor((level.x + WEB_MERCATOR_EXTENT) / cell_size).astype(np.int64) * cells_count
+                + np.floor((level.y + WEB_MERCATOR_EXTENT) / cell_size).astype(np.int64)
+            )
+            _, first_item, clusters = np.unique(cells_id, return_index=True, return_inverse=True)
+            count = np.bincount(clusters, weights=level.count).astype(np.int64)
+            level = self.levels[z] = ClusterLevel(
+                np.bincount(clusters, weights=level.x * level.count) / count,
+                np.bincount(clusters, weights=level.y * level.count) / count,
+                count,
+                level.row[first_item],
+            )
+
+    def get_level(self, z: int) -> ClusterLevel:
+        """To get the clusters of a zoom level, or the points beyond the last zoom level"""
+        if z > self.max_zoom:
+            return self.points
+        return self.levels[max(z, self.min_zoom)]
+
+    def get_viewport(self, x_start: float, x_end: float, y_start: float, y_end: float, width: int
+                     ) -> ClusterLevel:
+        """To get the clusters visible on a map, at the zoom level matching its width (pixels)"""
+        level = self.get_level(zoom_for_viewport(x_start, x_end, width, self.tile_size))
+        is_visible = (
+            (level.x >= min(x_start, x_end)) & (level.x <= max(x_start, x_end))
+            & (level.y >= min(y_start, y_end)) & (level.y <= max(y_start, y_end))
+        )
+        return ClusterLevel(level.x[is_visible], level.y[is_visible], level.count[is_visible],
+                            level.row[is_visible])
+
+
+class ClusteredPointLayer(ViewportLayer, PointLayer):
+    """
+    A point layer displaying clusters at coarse zoom levels and the points at fine zoom levels (bokeh server). The
+    glyph size grows with the points count of the clusters, available on the 'count' column. The attributes of the
+    clusters containing several points are empty.
+    """
+    _clusters: PointClusters | None = None
+    _TOOLTIP_EXCLUDED_COLUMNS: List[str] = ["x", "y", "size"]
+
+    def __init__(self, title: str, data: gpd.GeoDataFrame, from_epsg: int, min_zoom: int = 0, max_zoom: int = 16,
+                 cluster_radius: int = 40, size: float = 8, max_size: float = 40, **style_parameters) -> None:
+        """
+        :param min_zoom: first zoom level clustered
+        :type min_zoom: int
+        :param max_zoom: last zoom level clustered
+        :type max_zoom: int
+        :param cluster_radius: cluster cell width (pixels)
+        :type cluster_radius: int
+        :param size: glyph size of a single point
+        :type size: float
+        :param max_size: glyph size of the biggest cluster
+        :type max_size: float
+        """
+        self._clusters_parameters = {"min_zoom": min_zoom, "max_zoom": max_zoom, "radius": cluster_radius}
+        self._size = size
+        self._max_size = max_size
+        super().__init__(title=title, data=data, from_epsg=from_epsg, **style_parameters)
+
+    @property
+    def clusters(self) -> PointClusters:
+        self._materialize()
+        return self._clusters
+
+    @staticmethod
+    def _clean_data(data: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        return data.explode(index_parts=False)
+
+    def _prepare_projected_data(self, data: gpd.GeoDataFrame) -> Tuple[gpd.GeoDataFrame, Dict[str, Any]]:
+        data, derived = super()._prepare_projected_data(data)
+        # the clusters are set on the layer with the data (the conversion can run on a thread)
+        return data, {**derived, "clusters": PointClusters(data, **self._clusters_parameters)}
+
+    def _set_derived_data(self, derived: Dict[str, Any]) -> None:
+        super()._set_derived_data(derived)
+        self._clusters = derived["clusters"]
+
+    def _to_data_source_data(self, data: gpd.GeoDataFrame, derived: Dict[str, Any]) -> Dict[str, list]:
+        clusters = derived["clusters"]
+
+        attributes_columns = data.columns.drop(data.geometry.name)
+        if clusters.points.x.shape[0] == 0:
+            # no points: no extent to display
+            return {column: [] for column in ["x", "y", "count", "size", *attributes_columns]}
+
+        if self._viewport is None:
+            # the map extent is unknown: the whole data at the zoom level where it fits in a tile
+            x_min, y_min, x_max, y_max = data.total_bounds
+            level = clusters.get_viewport(x_min, x_max, y_min, y_max, clusters.tile_size)
+        else:
+            level = clusters.get_viewport(*self._viewport)
+
+        is_cluster = level.count > 1
+        attributes = data[attributes_columns].iloc[level.row]
+        return {
+            "x": level.x,
+            "y": level.y,
+            "count": level.count,
+            "size": self._size + (self._max_size - self._size) * np.sqrt(
+                (level.count - 1) / max(clusters.levels[clusters.min_zoom].count.max(initial=1) - 1, 1)
+            ),
+            **{
+                column: attributes[column].astype(object).where(~is_cluster, None).to_list()
+                for column in attributes.columns
+            },
+        }
+
+    def render(self, figure_obj: figure) -> None:
+        """render the bokeh object"""
+        self._before_render()
+        render = figure_obj.scatter(
+            x="x", y="y", size="size", source=self._data_source, **self._glyph_parameters()
+        )
+        self._set_tooltip(figure_obj, render)
+        self._watch_viewport(figure_obj)
@@ -1,4 +1,6 @@
-from typing import List, Set
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Set, Tuple
 
 from shapely.geometry import base
 from shapely.geometry import Point
@@ -14,7 +16,23 @@ from shapely.geometry import MultiPolygon
 
 from shapely.geometry import GeometryCollection
 
-import geopandas as gpd
+import numpy as np
+import shapely
+
+if TYPE_CHECKING:
+    # the conversion core does not require geopandas
+    import geopandas as gpd
+
+# geometry families indexed by shapely type id
+GEOM_FAMILY_BY_TYPE_ID: Dict[int, str] = {
+    shapely.GeometryType.POINT: "Point",
+    shapely.GeometryType.LINESTRING: "LineString",
+    shapely.GeometryType.LINEARRING: "LineString",
+    shapely.GeometryType.POLYGON: "Polygon",
+    shapely.GeometryType.MULTIPOINT: "MultiPoint",
+    shapely.GeometryType.MULTILINESTRING: "LineString",
+    shapely.GeometryType.MULTIPOLYGON: "Polygon",
+}
 
 
 def geometry_2_bokeh_format(geometry: base, coord_output_format: str = "xy") -> List[float | tuple[float]]:
@@ -62,13 +80,157 @@ def geometry_2_bokeh_format(geometry: base, coord_output_format: str = "xy") ->
             [geometry_2_bokeh_format(feat, coord_output_format) for feat in geometry]
         )
 
-    if isinstance(geometry, (MultiPoint, GeometryCollection)):
+    if isinstance(geometry, MultiPoint):
         raise ValueError(
             f"{geometry.geom_type} not supported"
         )
 
+    if isinstance(geometry, GeometryCollection):
+        # flattened as the multi geometry of its family: the mixed collections are split by split_gdf_by_geom_type
+        parts = shapely.get_parts(geometry)
+        families = {GEOM_FAMILY_BY_TYPE_ID[type_id] for type_id in shapely.get_type_id(parts)}
+        if len(families) > 1:
+            raise ValueError(f"{geometry.geom_type} mixing {sorted(families)} not supported")
+        if families == {"Point"}:
+            if len(parts) > 1:
+                raise ValueError(f"{geometry.geom_type} of several points not supported")
+            return geometry_2_bokeh_format(parts[0], coord_output_format)
+        for feat in parts:
+            coord_values.extend(geometry_2_bokeh_format(feat, coord_output_format))
+
     return coord_values
 
 
+def to_typed_arrays(values: list, dtype: np.dtype = np.float64, min_size: int = 32) -> list | np.ndarray:
+    """
+    to_typed_arrays
+
+    To convert nested coordinates lists (bokeh format) into NumPy arrays at the deepest level: bokeh serializes
+    them as binary typed arrays (base64 encoded, not compressed) instead of JSON number lists. The lists shorter than min_size are kept,
+    a binary buffer being heavier than a few numbers.
+
+    :type values: list
+    :type dtype: np.dtype
+    :type min_size: int
+
+    :return: np.ndarray or list of np.ndarray
+    """
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        return values.astype(dtype, copy=False)
+    if any(isinstance(value, (list, tuple, np.ndarray)) for value in values):
+        return [to_typed_arrays(value, dtype, min_size) for value in values]
+    if len(values) < min_size:
+        return values
+    return np.asarray(values, dtype=dtype)
+
+
+def _split_offsets(values: list | np.ndarray, offsets: np.ndarray) -> list:
+    """To split an array (views) or a list from absolute offsets"""
+    if isinstance(values, np.ndarray):
+        return np.split(values[offsets[0]:offsets[-1]], offsets[1:-1] - offsets[0])
+    return [values[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def ragged_2_bokeh_format(geometry_type: shapely.GeometryType, x: np.ndarray, y: np.ndarray,
+                          offsets: List[np.ndarray]) -> Tuple[list | np.ndarray, list | np.ndarray, np.ndarray]:
+    """
+    ragged_2_bokeh_format
+
+    To convert coordinates arrays and their offsets (geoarrow layout) to the bokeh columns format, with NumPy only:
+    the coordinates are split as views. MultiPoint and MultiLineString are exploded (bokeh cannot draw
+    discontinuous lines).
+
+    :type geometry_type: shapely.GeometryType
+    :type x: np.ndarray
+    :type y: np.ndarray
+    :type offsets: list of np.ndarray, the offsets of each nesting level (geometries first)
+
+    :return: x values, y values and the geometry index of each row
+    """
+    features_count = offsets[0].shape[0] - 1 if len(offsets) > 0 else x.shape[0]
+    rows = np.arange(features_count)
+    if geometry_type in (shapely.GeometryType.MULTIPOINT, shapely.GeometryType.MULTILINESTRING):
+        # exploded: a row by part
+        rows = np.repeat(rows, np.diff(offsets[0]))
+
+    if geometry_type == shapely.GeometryType.POINT:
+        return x, y, rows
+
+    if geometry_type == shapely.GeometryType.MULTIPOINT:
+        points = slice(offsets[0][0], offsets[0][-1])
+        return x[points], y[points], rows
+
+    if geometry_type == shapely.GeometryType.MULTILINESTRING:
+        lines = slice(offsets[0][0], offsets[0][-1])
+        return _split_offsets(x, offsets[-1])[lines], _split_offsets(y, offsets[-1])[lines], rows
+
+    # rings, then polygons (bokeh format: a list of polygons, each one a list of rings)
+    x_values, y_values = _split_offsets(x, offsets[-1]), _split_offsets(y, offsets[-1])
+    if geometry_type == shapely.GeometryType.LINESTRING:
+        return x_values, y_values, rows
+
+    x_values, y_values = _split_offsets(x_values, offsets[-2]), _split_offsets(y_values, offsets[-2])
+    if geometry_type == shapely.GeometryType.MULTIPOLYGON:
+        return _split_offsets(x_values, offsets[0]), _split_offsets(y_values, offsets[0]), rows
+    return [[polygon] for polygon in x_values], [[polygon] for polygon in y_values], rows
+
+
+def geometries_2_bokeh_format(geometries: np.ndarray
+                              ) -> Tuple[list | np.ndarray, list | np.ndarray, np.ndarray]:
+    """
+    geometries_2_bokeh_format
+
+    To convert an array of geometries of the same family to the bokeh columns format, vectorized with
+    shapely.to_ragged_array
+
+    :type geometries: np.ndarray of shapely geometries
+
+    :return: x values, y values and the geometry index of each row
+    """
+    geometry_type, coordinates, offsets = shapely.to_ragged_array(geometries)
+    return ragged_2_bokeh_format(geometry_type, coordinates[:, 0], coordinates[:, 1], list(reversed(offsets)))
+
+
 def get_gdf_geom_type(input_gdf: gpd.GeoDataFrame, geom_col: str) -> Set[str]:
     return set(input_gdf[geom_col].geom_type.unique())
+
+
+def split_gdf_by_geom_type(input_gdf: gpd.GeoDataFrame, geom_col: str) -> Dict[str, gpd.GeoDataFrame]:
+    """
+    split_gdf_by_geom_type
+
+    To split a GeoDataFrame by geometry family (Point, MultiPoint, LineString, Polygon) in one pass. The
+    GeometryCollection are flattened before, their parts keeping the attributes of the feature.
+
+    :type input_gdf: gpd.GeoDataFrame
+    :type geom_col: str
+
+    :return: dict of GeoDataFrame by geometry family
+    """
+    import geopandas as gpd
+    import pandas as pd
+
+    geometries = input_gdf[geom_col].values
+    type_ids = shapely.get_type_id(geometries)
+
+    collections = type_ids == shapely.GeometryType.GEOMETRYCOLLECTION
+    if collections.any():
+        parts, parts_index = shapely.get_parts(geometries[collections], return_index=True)
+        collections_gdf = input_gdf.loc[collections].iloc[parts_index].copy()
+        collections_gdf[geom_col] = parts
+        input_gdf = gpd.GeoDataFrame(
+            pd.concat([input_gdf.loc[~collections], collections_gdf]), geometry=geom_col, crs=input_gdf.crs
+        )
+        type_ids = shapely.get_type_id(input_gdf[geom_col].values)
+
+    # the last item catches the missing geometries (type id: -1)
+    families = np.array([
+        GEOM_FAMILY_BY_TYPE_ID.get(type_id, "")
+        for type_id in range(shapely.GeometryType.GEOMETRYCOLLECTION + 1)
+    ] + [""])
+    families = families[type_ids]
+    return {
+        family: input_gdf.loc[families == family]
+        for family in dict.fromkeys(families)
+        if family
+    }
@@ -1,22 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from concurrent.futures import Executor
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from functools import partial
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Dict
 from typing import List
 from typing import Tuple
 
-import geopandas as gpd
+import numpy as np
+import shapely
 
-from bokeh.plotting import figure
+from bokeh.core.property.validation import validate
+from bokeh.core.serialization import Serializer
+from bokeh.models import CategoricalColorMapper
 from bokeh.models import ColumnDataSource
-from bokeh.models.renderers import GlyphRenderer
 
 from bokeh.models import HoverTool
 
+from gdf2bokeh.budget import LayerBudget
+from gdf2bokeh.budget import LayerStats
+from gdf2bokeh.budget import compute_stats
 from gdf2bokeh.geometry import geometry_2_bokeh_format
+from gdf2bokeh.geometry import to_typed_arrays
+from gdf2bokeh.projection import to_web_mercator
+from gdf2bokeh.style import Palette
+from gdf2bokeh.style import build_color_transform
+from gdf2bokeh.style import is_categorical
+from gdf2bokeh.style import to_categories
+from gdf2bokeh.style import update_color_transform
+from gdf2bokeh.topology import Topology
+from gdf2bokeh.topology import build_topology
+
+if TYPE_CHECKING:
+    # only used by the type hints: geopandas and bokeh.plotting are loaded by the data and the figure themselves
+    import geopandas as gpd
+    from bokeh.document import Document
+    from bokeh.models.renderers import GlyphRenderer
+    from bokeh.plotting import figure
 
 
 class GeomTypeError(Exception):
     pass
 
 
+class LayerSelectionError(Exception):
+    pass
+
+
+_UPDATE_EXECUTOR: ThreadPoolExecutor | None = None
+
+
+def get_update_executor() -> ThreadPoolExecutor:
+    """To get the thread pool shared by all the layers to convert their data off the event loop"""
+    global _UPDATE_EXECUTOR
+    if _UPDATE_EXECUTOR is None:
+        _UPDATE_EXECUTOR = ThreadPoolExecutor(thread_name_prefix="gdf2bokeh")
+    return _UPDATE_EXECUTOR
+
+
+def get_serialized_size(data: Dict[str, Any]) -> int:
+    """the serialized size (bytes) of data source columns, as embedded in a document"""
+    return len(json.dumps(Serializer(deferred=False).encode(data)))
+
+
+def merge_lines(data: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """
+    merge_lines
+
+    To drop the duplicated lines and to merge the contiguous lines sharing the same attributes (shapely.line_merge
+    on a multilinestring by attributes group). The merged lines keep the index of the first line of their group.
+
+    :type data: gpd.GeoDataFrame, exploded
+
+    :return: gpd.GeoDataFrame of linestrings
+    """
+    geometries = data.geometry.values
+    data = data.loc[~(shapely.is_missing(geometries) | shapely.is_empty(geometries))]
+    attributes = data.drop(columns=data.geometry.name)
+    normalized = shapely.to_wkb(shapely.normalize(data.geometry.values))
+    data = data.loc[~attributes.assign(__geometry=normalized).duplicated().to_numpy()]
+    if data.shape[0] == 0:
+        return data
+
+    if attributes.shape[1] == 0:
+        groups = np.zeros(data.shape[0], dtype=np.int64)
+    else:
+        groups = data[attributes.columns].groupby(list(attributes.columns), dropna=False, sort=False).ngroup()
+        groups = groups.to_numpy()
+    # multilinestrings expects the geometries ordered by group
+    order = np.argsort(groups, kind="stable")
+    _, first_rows = np.unique(groups[order], return_index=True)
+    merged = shapely.line_merge(
+        shapely.multilinestrings(data.geometry.values[order], indices=groups[order])
+    )
+    lines, lines_group = shapely.get_parts(merged, return_index=True)
+    return data.iloc[order[first_rows][lines_group]].set_geometry(lines, crs=data.crs)
+
+
 class GeomTypes(set, Enum):
     LINESTRINGS = {"LineString", "MultiLineString"}
     POLYGONS = {"Polygon", "MultiPolygon"}
@@ -33,18 +120,63 @@ class GeomTypes(set, Enum):
 
 class LayerCore:
     title = None
+    legend_label = None
     _data = None
     _geom_type = None
     _data_source = None
     _style_parameters = None
+    _budget = None
+    _stats = None
+    _lazy = False
+    _pending_data = None
+    _data_version = 0
+    _scheduled_data = None
+    _scheduled_data_version = 0
+    _scheduled_callback = None
+    _pending_update = None
+    _style_by = None
+    _color_transform = None
+    _spatial_index = None
+    _spatial_index_data = None
+    _derived = None
 
     __GEOMETRY_FIELD_NAME: str = "geometry"
     _DEFAULT_EPSG: int = 3857
-
-    def __init__(self, title: str, data: gpd.GeoDataFrame, from_epsg: int, **style_parameters):
+    _TOOLTIP_EXCLUDED_COLUMNS: List[str] = ["x", "y"]
+    # the data source rows match the data rows, so the query results can be selected on the map
+    _SELECTABLE: bool = True
+    # the glyph properties colored by the style_by column
+    _STYLE_BY_PROPERTIES: Tuple[str, ...] = ("fill_color",)
+    # the data source holds the data features: the budget applies. The layers sending a reduction of the data
+    # (aggregated cells, clusters, visible tiles) skip it
+    _BUDGETED: bool = True
+
+    def __init__(self, title: str, data: gpd.GeoDataFrame, from_epsg: int, budget: LayerBudget | None = None,
+                 legend_label: str | None = None, lazy: bool = False, style_by: str | None = None,
+                 palette: Palette | None = None, style_range: Tuple[float, float] | None = None,
+                 **style_parameters):
+        """
+        :param lazy: if True, the data conversion is deferred until the layer is rendered (or its data/stats read).
+            Until then, assigning data only keeps a reference on it.
+        :type lazy: bool
+        :param style_by: column coloring the features on the client side (factor_cmap for categories, linear_cmap
+            for numeric values), the categories are listed on the legend
+        :type style_by: str
+        :param palette: bokeh palette name or list of colors used by style_by
+        :type palette: str or list of str
+        :param style_range: low and high bounds of the numeric values colored, default: the data range
+        :type style_range: tuple of float
+        """
         self._data_source = ColumnDataSource()  # self.data_source_structure(data)
         self._from_epsg = from_epsg
+        self._budget = budget
+        self._lazy = lazy
+        self._style_by = style_by
+        self._palette = palette
+        self._style_range = style_range
         self.title = title
+        # layers sharing the same legend label are grouped on the same legend item
+        self.legend_label = legend_label or title
         self.data = data
         self._style_parameters = style_parameters
 
@@ -55,22 +187,302 @@ class LayerCore:
     def geom_type(self) -> GeomTypes:
         return self._geom_type
 
+    @property
+    def stats(self) -> LayerStats:
+        """vertices count and estimated ColumnDataSource size of the layer"""
+        self._materialize()
+        return self._stats
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._pending_data is None
+
     @property
     def data(self) -> gpd.GeoDataFrame:
+        self._materialize()
         return self._data
 
     @data.setter
     def data(self, data: gpd.GeoDataFrame) -> None:
-        self._data = data
-        if self._from_epsg != self._DEFAULT_EPSG:
-            self._data = self._data.to_crs(f"epsg:{self._DEFAULT_EPSG}")
+        # supersede the updates in progress
+        self._data_version += 1
+        self._pending_data = data
+        if not self._lazy:
+            self._materialize()
+
+    def schedule_data(self, data: gpd.GeoDataFrame, interval: int = 100, executor: Executor | None = None) -> None:
+        """
+        To coalesce high-frequency data updates (from a widget callback for example): the data is applied after
+        `interval` milliseconds and only the latest data scheduled during this interval is converted.
+
+        :param data: the new data
+        :type data: gpd.GeoDataFrame
+        :param interval: delay (ms) before applying the latest data
+        :type interval: int
+        :param executor: if set, the conversion runs on it and its result is applied on the next tick of the
+            document, keeping the server event loop responsive
+        :type executor: concurrent.futures.Executor
+        """
+        self._scheduled_data = data
+        # a data assigned after this call supersedes it
+        self._scheduled_data_version = self._data_version
+        if self._scheduled_callback is not None:
+            # a callback is already waiting, it will apply the latest data
+            return
+
+        from bokeh.io import curdoc
+
+        document = self._data_source.document or curdoc()
+        self._scheduled_callback = document.add_timeout_callback(
+            partial(self._apply_scheduled_data, document, executor), interval
+        )
+
+    def _apply_scheduled_data(self, document: Document, executor: Executor | None) -> None:
+        self._scheduled_callback = None
+        data, self._scheduled_data = self._scheduled_data, None
+        if self._scheduled_data_version != self._data_version:
+            # superseded by a more recent update
+            return
+        if executor is None:
+            self.data = data
+            return
+
+        self._data_version += 1
+        data_version = self._data_version
+        future = executor.submit(self._convert, data)
+        future.add_done_callback(
+            lambda done: document.add_next_tick_callback(partial(self._apply_converted, done, data_version))
+        )
+
+    async def set_data_async(self, data: gpd.GeoDataFrame, executor: Executor | None = None) -> bool:
+        """
+        To update the data without blocking the event loop: the reprojection and the conversion run on a thread
+        pool, then the result is applied on the next tick of the document (under its lock), or immediately if the
+        layer is not attached to a document. An update in progress is cancelled by a more recent one.
+
+        :param data: the new data
+        :type data: gpd.GeoDataFrame
+        :param executor: executor running the conversion, default: the thread pool shared by the layers
+        :type executor: concurrent.futures.Executor
+
+        :return: False if the update has been superseded
+        """
+        self._data_version += 1
+        data_version = self._data_version
+        if self._pending_update is not None:
+            self._pending_update.cancel()
+
+        loop = asyncio.get_running_loop()
+        update = self._pending_update = loop.run_in_executor(executor or get_update_executor(), self._convert, data)
+        try:
+            await update
+        except asyncio.CancelledError:
+            if data_version != self._data_version:
+                return False
+            raise
+
+        document = self._data_source.document
+        if document is None:
+            return self._apply_converted(update, data_version)
+        document.add_next_tick_callback(partial(self._apply_converted, update, data_version))
+        return data_version == self._data_version
+
+    def _convert(self, data: gpd.GeoDataFrame
+                 ) -> Tuple[gpd.GeoDataFrame, LayerStats, Dict[str, Any], Dict[str, list]]:
+        """To run the whole conversion, without touching the layer (thread safe)"""
+        data, stats, derived = self._prepare_data(data)
+        return data, stats, derived, self._data_source_data(data, derived)
+
+    def _apply_converted(self, future: Future | asyncio.Future, data_version: int) -> bool:
+        if data_version != self._data_version:
+            # superseded by a more recent update
+            return False
+        self._pending_data = None
+        self._data, self._stats, derived, self._data_source.data = future.result()
+        self._set_derived_data(derived)
+        self._on_data_source_updated()
+        return True
+
+    @property
+    def is_selectable(self) -> bool:
+        return self._SELECTABLE
+
+    @property
+    def spatial_index(self) -> shapely.STRtree:
+        """the spatial index of the projected geometries (EPSG:3857), built on first use and on data updates"""
+        data = self.data
+        if self._spatial_index is None or self._spatial_index_data is not data:
+            self._spatial_index = shapely.STRtree(self._geometries(data))
+            self._spatial_index_data = data
+        return self._spatial_index
+
+    @staticmethod
+    def _geometries(data: gpd.GeoDataFrame) -> np.ndarray:
+        return data.geometry.values
+
+    @staticmethod
+    def _take_rows(data: gpd.GeoDataFrame, rows: np.ndarray) -> gpd.GeoDataFrame:
+        return data.iloc[rows]
+
+    def query_rows(self, geometry: shapely.Geometry, predicate: str | None = "intersects",
+                   distance: float | None = None) -> np.ndarray:
+        """
+        To find the rows of the features matching a spatial predicate, with the spatial index
+
+        :param geometry: the geometry queried, projected on EPSG:3857
+        :type geometry: shapely.Geometry
+        :param predicate: the shapely predicate tested (intersects, within, contains...), None to compare the
+            bounding boxes only
+        :type predicate: str
+        :param distance: if set, the features within this distance (map units) of the geometry are found
+        :type distance: float
+
+        :return: the sorted rows positions
+        """
+        if distance is not None:
+            predicate = "dwithin"
+        return np.sort(self.spatial_index.query(geometry, predicate=predicate, distance=distance))
+
+    def query(self, geometry: shapely.Geometry, predicate: str | None = "intersects",
+              distance: float | None = None) -> gpd.GeoDataFrame:
+        """To get the features matching a spatial predicate (see query_rows)"""
+        return self._take_rows(self.data, self.query_rows(geometry, predicate, distance))
+
+    def select(self, geometry: shapely.Geometry, predicate: str | None = "intersects",
+               distance: float | None = None) -> gpd.GeoDataFrame:
+        """To select on the map the features matching a spatial predicate (see query_rows), and to get them"""
+        if not self.is_selectable:
+            raise LayerSelectionError(f"Layer '{self.title}' features cannot be selected")
+
+        rows = self.query_rows(geometry, predicate, distance)
+        # the rows come from the spatial index: the validation of a large selection would cost more than the query
+        with validate(False):
+            self._data_source.selected.indices = rows.tolist()
+        return self._take_rows(self.data, rows)
+
+    def _materialize(self) -> None:
+        """To run the pending data conversion"""
+        if self._pending_data is None:
+            return
+
+        data, self._pending_data = self._pending_data, None
+        self._data, self._stats, derived = self._prepare_data(data)
+        self._set_derived_data(derived)
         # data is updated, so let's go to refresh the data_source container linked to bokeh layer
         self.refresh_data_source()
 
+    def _prepare_data(self, data: gpd.GeoDataFrame) -> Tuple[gpd.GeoDataFrame, LayerStats, Dict[str, Any]]:
+        """
+        To reproject the data and to check it against the budget, without touching the layer (thread safe)
+
+        :return: the data, its stats and the objects derived from it (see _set_derived_data)
+        """
+        data = self._clean_data(data)
+        if self._from_epsg != self._DEFAULT_EPSG:
+            data = to_web_mercator(data)
+        data, derived = self._prepare_projected_data(data)
+        if self._budget is not None and self._BUDGETED:
+            data, stats = self._budget.apply(self.title, data, self._budget_simplify(data, derived))
+            return data, stats, derived
+        return data, compute_stats(data), derived
+
+    @staticmethod
+    def _clean_data(data: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        return data
+
+    def _prepare_projected_data(self, data: gpd.GeoDataFrame) -> Tuple[gpd.GeoDataFrame, Dict[str, Any]]:
+        """called on the data projected on EPSG:3857, before the budget: the data and the objects derived from it"""
+        return data, {}
+
+    def _set_derived_data(self, derived: Dict[str, Any]) -> None:
+        """called with the objects derived from the data (see _prepare_projected_data), when the data is set"""
+        self._derived = derived
+
+    def _budget_simplify(self, data: gpd.GeoDataFrame,
+                         derived: Dict[str, Any]) -> Callable[[float], gpd.GeoDataFrame] | None:
+        """the simplification used by the simplify policy of the budget, default (None): each geometry is simplified"""
+        return None
+
+    def _before_render(self) -> None:
+        # the data updates of a rendered layer must reach the bokeh document
+        self._lazy = False
+        self._materialize()
+
     def refresh_data_source(self):
-        raise NotImplemented
+        data = self.data
+        self._data_source.data = self._data_source_data(data, self._derived or {})
+        self._on_data_source_updated()
+
+    def _on_data_source_updated(self) -> None:
+        """called once the data source holds the new data"""
+        if self._color_transform is not None:
+            update_color_transform(self._color_transform, self._style_values(), self._palette)
+
+    def _style_values(self) -> np.ndarray:
+        return np.asarray(self._data[self._style_by])
+
+    def _glyph_parameters(self) -> Dict[str, Any]:
+        """the legend and the style parameters of the glyph, the colors mapped from the style_by column if set"""
+        if self._style_by is None:
+            return {"legend_label": self.legend_label, **self._style_parameters}
+
+        self._color_transform = build_color_transform(self._style_by, self._style_values(), self._palette,
+                                                      self._style_range)
+        legend = {"legend_label": self.legend_label}
+        if isinstance(self._color_transform.transform, CategoricalColorMapper):
+            legend = {"legend_field": self._style_by}
+        return {
+            **legend,
+            **dict.fromkeys(self._STYLE_BY_PROPERTIES, self._color_transform),
+            **self._style_parameters,
+        }
+
+    def _data_source_data(self, data: gpd.GeoDataFrame, derived: Dict[str, Any]) -> Dict[str, list]:
+        """the data source data, the categories of the style_by column as strings (the color mapper factors)"""
+        data_source_data = self._to_data_source_data(data, derived)
+        if self._style_by in data_source_data and is_categorical(np.asarray(data[self._style_by])):
+            data_source_data[self._style_by] = to_categories(data_source_data[self._style_by])
+        return data_source_data
+
+    def _to_data_source_data(self, data: gpd.GeoDataFrame, derived: Dict[str, Any]) -> Dict[str, list]:
+        """
+        To convert the prepared data to the bokeh ColumnDataSource data
+
+        :param data: the prepared data
+        :type data: gpd.GeoDataFrame
+        :param derived: the objects derived from the data (see _prepare_projected_data), not set on the layer yet
+            when the conversion runs on a thread
+        :type derived: dict
+        """
+        return dict(self._format_gdf_features_to_bokeh(data).data)
+
+    def to_binary_data_source_data(self, coordinates_dtype: np.dtype = np.float64) -> Dict[str, Any]:
+        """
+        To convert the coordinates and the numeric columns of the data source into NumPy arrays, serialized by
+        bokeh as binary typed arrays (base64 encoded, not compressed) instead of JSON number lists. The data source of the layer is not modified: the converted columns
+        are returned.
+
+        :param coordinates_dtype: coordinates type, np.float32 quantizes them (about 1 meter precision)
+        :type coordinates_dtype: np.dtype
 
-    def data_source_structure(self, data: gpd.geodataframe) -> ColumnDataSource:
+        :return: the data source columns
+        """
+        self._materialize()
+        binary_data = {}
+        for column, values in self._data_source.data.items():
+            if column in ("x", "y"):
+                binary_data[column] = to_typed_arrays(values, coordinates_dtype)
+                continue
+            values_array = np.asarray(values)
+            binary_data[column] = values_array if values_array.dtype.kind in "iufb" else values
+        return binary_data
+
+    @property
+    def data_source_size(self) -> int:
+        """the serialized data source size (bytes), as embedded in a document"""
+        return get_serialized_size(self._data_source.data)
+
+    def data_source_structure(self, data: gpd.GeoDataFrame) -> ColumnDataSource:
         """
         To build the bokeh data structure from a GeoDataframe.
         """
@@ -100,14 +512,15 @@ class LayerCore:
         return bokeh_data
 
     def _set_tooltip(self, figure_obj: figure, rendered: GlyphRenderer) -> None:
-        column_tooltip = self.__build_column_tooltip(self._data_source)
+        column_tooltip = self.__build_column_tooltip(self._data_source, self._TOOLTIP_EXCLUDED_COLUMNS)
         figure_obj.add_tools(
             HoverTool(tooltips=column_tooltip, renderers=[rendered], mode="mouse")
         )
 
     @staticmethod
-    def __build_column_tooltip(features_column_data_source: ColumnDataSource) -> List[Tuple[str, str]]:
-        columns = list(filter(lambda x: x not in ["x", "y"], features_column_data_source.data.keys()))
+    def __build_column_tooltip(features_column_data_source: ColumnDataSource,
+                               excluded_columns: List[str]) -> List[Tuple[str, str]]:
+        columns = list(filter(lambda x: x not in excluded_columns, features_column_data_source.data.keys()))
         return list(
             zip(map(lambda x: str(x.upper()), columns), map(lambda x: f"@{x}", columns))
         )
@@ -115,65 +528,118 @@ class LayerCore:
 
 class PointLayer(LayerCore):
     _geom_type = GeomTypes.POINT
+    _STYLE_BY_PROPERTIES: Tuple[str, ...] = ("fill_color", "line_color")
     _DEFAULT_STYLE = "circle"
 
     def __init__(self, title: str, data: gpd.GeoDataFrame, from_epsg: int, **style_parameters) -> None:
         super().__init__(title=title, data=data, from_epsg=from_epsg, **style_parameters)
 
-    def refresh_data_source(self):
-        self._data_source.data = dict(self._format_gdf_features_to_bokeh(self.data).data)
-
     def render(self, figure_obj: figure) -> None:
         """render the bokeh object"""
+        self._before_render()
         render = getattr(figure_obj, self._DEFAULT_STYLE)(
-            x="x", y="y", source=self._data_source, legend_label=self.title, **self._style_parameters
+            x="x", y="y", source=self._data_source, **self._glyph_parameters()
         )
         self._set_tooltip(figure_obj, render)
 
 
 class MultiPointLayer(PointLayer):
     def __init__(self, title: str, data: gpd.GeoDataFrame, from_epsg: int, **style_parameters) -> None:
-        data = data.explode(index_parts=False)
         super().__init__(title=title, data=data, from_epsg=from_epsg, **style_parameters)
 
+    @staticmethod
+    def _clean_data(data: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        return data.explode(index_parts=False)
+
 
 class LinestringLayer(LayerCore):
     _geom_type = GeomTypes.LINESTRINGS
+    _STYLE_BY_PROPERTIES: Tuple[str, ...] = ("line_color",)
+    _merge_lines = False
 
-    def __init__(self, title: str, data: gpd.GeoDataFrame, from_epsg: int, **style_parameters) -> None:
-        data = self._clean_lines_from_gdf(data)
+    def __init__(self, title: str, data: gpd.GeoDataFrame, from_epsg: int, merge_lines: bool = False,
+                 **style_parameters) -> None:
+        """
+        :param merge_lines: if True, the exact duplicates are dropped and the contiguous lines sharing the same
+            attributes are merged, reducing the glyphs count
+        :type merge_lines: bool
+        """
+        self._merge_lines = merge_lines
         super().__init__(title=title, data=data, from_epsg=from_epsg, **style_parameters)
 
-    def refresh_data_source(self):
+    def _clean_data(self, data: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
         # go to check the multilinestring continuity, because the bokeh format cannot display a multilinestring
         # containing a discontinuity. We'll convert the objet into linestring if needed.
-        data = self._clean_lines_from_gdf(self.data)
-        self._data_source.data = dict(self._format_gdf_features_to_bokeh(data).data)
+        data = data.explode(index_parts=False)
+        if self._merge_lines:
+            return merge_lines(data)
+        return data
 
     def render(self, figure_obj: figure) -> None:
         """render the bokeh object"""
+        self._before_render()
         render = figure_obj.multi_line(
-            xs="x", ys="y", source=self._data_source, legend_label=self.title, **self._style_parameters
+            xs="x", ys="y", source=self._data_source, **self._glyph_parameters()
         )
         self._set_tooltip(figure_obj, render)
 
-    @staticmethod
-    def _clean_lines_from_gdf(input_gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
-        return input_gdf.explode(index_parts=False)
-
 
 class PolygonLayer(LayerCore):
     _geom_type = GeomTypes.POLYGONS
+    _use_topology = False
+    _topology = None
 
-    def __init__(self, title: str, data: gpd.GeoDataFrame, from_epsg: int, **style_parameters) -> None:
+    def __init__(self, title: str, data: gpd.GeoDataFrame, from_epsg: int, topology: bool = False,
+                 topology_tolerance: float | None = None, **style_parameters) -> None:
+        """
+        :param topology: if True, the boundaries shared by adjacent polygons are extracted as arcs (stored once),
+            and the polygons are rebuilt from them. The shared vertices must be exactly equal, as on a tessellation.
+        :type topology: bool
+        :param topology_tolerance: if set, the arcs are simplified with this tolerance (map units, EPSG:3857): each
+            shared boundary is simplified once, so the adjacent polygons stay gap-free
+        :type topology_tolerance: float
+        """
+        self._use_topology = topology
+        self._topology_tolerance = topology_tolerance
         super().__init__(title=title, data=data, from_epsg=from_epsg, **style_parameters)
 
-    def refresh_data_source(self):
-        self._data_source.data = dict(self._format_gdf_features_to_bokeh(self.data).data)
+    @property
+    def topology(self) -> Topology | None:
+        """the shared arcs of the polygons, with the topology option"""
+        self._materialize()
+        return self._topology
+
+    def _prepare_projected_data(self, data: gpd.GeoDataFrame) -> Tuple[gpd.GeoDataFrame, Dict[str, Any]]:
+        if not self._use_topology:
+            return data, {}
+
+        topology = build_topology(data.geometry.values)
+        if self._topology_tolerance is not None:
+            topology = topology.simplify(self._topology_tolerance)
+        # the topology is set on the layer with the data (the conversion can run on a thread)
+        return data.set_geometry(topology.to_geometries(), crs=data.crs), {"topology": topology}
+
+    def _set_derived_data(self, derived: Dict[str, Any]) -> None:
+        super()._set_derived_data(derived)
+        self._topology = derived.get("topology")
+
+    def _budget_simplify(self, data: gpd.GeoDataFrame,
+                         derived: Dict[str, Any]) -> Callable[[float], gpd.GeoDataFrame] | None:
+        topology = derived.get("topology")
+        if topology is None:
+            return None
+
+        def simplify(tolerance: float) -> gpd.GeoDataFrame:
+            # the shared boundaries are simplified once: the polygons stay gap-free
+            simplified = derived["topology"] = topology.simplify(tolerance)
+            return data.set_geometry(simplified.to_geometries(), crs=data.crs)
+
+        return simplify
 
     def render(self, figure_obj: figure) -> None:
         """render the bokeh object"""
+        self._before_render()
         render = figure_obj.multi_polygons(
-            xs="x", ys="y", source=self._data_source, legend_label=self.title, **self._style_parameters
+            xs="x", ys="y", source=self._data_source, **self._glyph_parameters()
         )
         self._set_tooltip(figure_obj, render)
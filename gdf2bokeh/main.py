@@ -1,10 +1,21 @@
+from functools import partial
+from typing import Callable
 from typing import Dict
 from typing import List
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import shapely
 import shapely.geometry.base
 
+from bokeh.embed import file_html
+from bokeh.events import SelectionGeometry
+from bokeh.models import BoxSelectTool
+from bokeh.models import LassoSelectTool
+from bokeh.models import TapTool
+from bokeh.resources import CDN
+
 from gdf2bokeh.app_map import AppMap
 
 from gdf2bokeh.layer import GeomTypes, MultiPointLayer
@@ -12,9 +23,22 @@ from gdf2bokeh.layer import PointLayer
 from gdf2bokeh.layer import LinestringLayer
 from gdf2bokeh.layer import PolygonLayer
 from gdf2bokeh.layer import LayerCore
+from gdf2bokeh.layer import get_serialized_size
+from gdf2bokeh.tiles import TiledLinestringLayer
+from gdf2bokeh.tiles import TiledPolygonLayer
 
+from gdf2bokeh.aggregate import AggregatedLayer
+from gdf2bokeh.budget import LayerBudget
+from gdf2bokeh.cluster import ClusteredPointLayer
 from gdf2bokeh.geometry import get_gdf_geom_type
+from gdf2bokeh.geometry import split_gdf_by_geom_type
+from gdf2bokeh.models import BinShape
 from gdf2bokeh.models import GeomFormat
+from gdf2bokeh.selection import selection_to_geometry
+from gdf2bokeh.temporal import TemporalLinestringLayer
+from gdf2bokeh.temporal import TemporalMultiPointLayer
+from gdf2bokeh.temporal import TemporalPointLayer
+from gdf2bokeh.temporal import TemporalPolygonLayer
 
 
 class Gdf2BokehError(Exception):
@@ -23,9 +47,19 @@ class Gdf2BokehError(Exception):
 
 class Gdf2Bokeh(AppMap):
     _layers = None
+    _budget = None
+    _lazy = False
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, budget: LayerBudget | None = None, lazy: bool = False, **kwargs):
+        """
+        :param budget: vertices/size budget applied on each layer added
+        :type budget: LayerBudget
+        :param lazy: to defer the data conversion of each layer added until it is rendered
+        :type lazy: bool
+        """
         super().__init__(*args, **kwargs)
+        self._budget = budget
+        self._lazy = lazy
         self.clear_layers()
 
     def clear_layers(self):
@@ -37,26 +71,207 @@ class Gdf2Bokeh(AppMap):
             layer.render(self.figure)
             self._legend_settings()
 
+    def on_selection(self, callback: Callable[[Dict[str, gpd.GeoDataFrame]], None] | None = None,
+                     tap_tolerance: int = 5) -> None:
+        """
+        To add the box, lasso and tap selection tools: the selection drawn on the map (bokeh server) is resolved
+        against the spatial index of each selectable layer, and the selected features are highlighted
+
+        :param callback: called with the selected features by layer title
+        :type callback: callable
+        :param tap_tolerance: the distance (pixels) around a click where the features are selected
+        :type tap_tolerance: int
+        """
+        self.figure.add_tools(BoxSelectTool(), LassoSelectTool(), TapTool())
+        self.figure.on_event(SelectionGeometry, partial(self._on_selection_geometry, callback, tap_tolerance))
+
+    def _on_selection_geometry(self, callback: Callable[[Dict[str, gpd.GeoDataFrame]], None] | None,
+                               tap_tolerance: int, event: SelectionGeometry) -> None:
+        if not event.final:
+            return
+
+        geometry = selection_to_geometry(event.geometry)
+        distance = None
+        if event.geometry["type"] == "point":
+            x_start, x_end = self.figure.x_range.start, self.figure.x_range.end
+            if x_start is not None and x_end is not None:
+                distance = tap_tolerance * abs(x_end - x_start) / self.figure.width
+
+        selection = {
+            title: layer.select(geometry, distance=distance)
+            for title, layer in self.layers.items()
+            if layer.is_selectable
+        }
+        if callback is not None:
+            callback(selection)
+
+    def export_html(self, path: str, compress: bool = True, quantize: bool = False,
+                    title: str | None = None) -> Dict[str, int]:
+        """
+        To export the map in a standalone HTML file
+
+        :param path: the HTML file path
+        :type path: str
+        :param compress: to store the coordinates and the numeric columns as binary typed arrays (base64 encoded by
+            bokeh, nothing is compressed) instead of JSON number lists
+        :type compress: bool
+        :param quantize: to store the coordinates as float32 (about 1 meter precision), with compress only
+        :type quantize: bool
+        :param title: the HTML page title, default: the figure title
+        :type title: str
+
+        :return: the embedded data size (bytes) by layer
+        """
+        layers_size = {}
+        exported_data = {}
+        for layer_title, layer in self.layers.items():
+            if compress:
+                exported_data[layer_title] = layer.to_binary_data_source_data(
+                    np.float32 if quantize else np.float64
+                )
+                layers_size[layer_title] = get_serialized_size(exported_data[layer_title])
+            else:
+                layers_size[layer_title] = layer.data_source_size
+
+        # the binary columns are only swapped in for the export: the layers keep their data
+        original_data = {}
+        try:
+            for layer_title, data in exported_data.items():
+                data_source = self.layers[layer_title]._data_source
+                original_data[layer_title] = dict(data_source.data)
+                data_source.data = data
+            html = file_html(self.figure, CDN, title or self.figure.title.text)
+        finally:
+            for layer_title, data in original_data.items():
+                self.layers[layer_title]._data_source.data = data
+
+        with open(path, "w", encoding="utf-8") as output_file:
+            output_file.write(html)
+        return layers_size
+
     def add_layer_from_geodataframe(self, title: str, data: gpd.GeoDataFrame, from_epsg: int,
-                                    **style_parameters) -> None:
-        """Add layer from a GeoDataframe"""
+                                    split_geom_types: bool = False, tiled: bool = False, cluster: bool = False,
+                                    time_column: str | None = None, **style_parameters) -> None:
+        """
+        Add layer from a GeoDataframe
+
+        With split_geom_types, a mixed GeoDataFrame is split by geometry family: each family is added as a layer
+        named '<title>_<family>' and grouped on the '<title>' legend item. Style parameters are shared by all the
+        layers created.
+
+        With tiled, line and polygon layers are cut into a tile pyramid and only the visible tiles are loaded when
+        the map is panned or zoomed (bokeh server). Tiles options (min_zoom, max_zoom, tiles_dir,
+        tiles_cache_size) can be set with the style parameters.
+
+        With cluster, point layers are clustered according to the zoom level of the map (bokeh server). Clustering
+        options (min_zoom, max_zoom, cluster_radius, max_size) can be set with the style parameters.
+
+        With time_column, the features are displayed by time step: see TemporalLayer (set_step, set_range, play,
+        slider).
+        """
         if data.shape[0] == 0:
             raise Gdf2BokehError("GeoDataFrame is empty")
 
         if not self.is_df_empty(data):
-            geom_types_on_data = get_gdf_geom_type(data, "geometry")
-            geom_type = GeomTypes.has_value(geom_types_on_data)
+            if split_geom_types:
+                for geom_family, family_data in split_gdf_by_geom_type(data, "geometry").items():
+                    geom_type = GeomTypes.has_value({geom_family})
+                    self.layers = self._build_layer(geom_type, f"{title}_{geom_type.name.lower()}", family_data,
+                                                    from_epsg, tiled, cluster, time_column, legend_label=title,
+                                                    **style_parameters)
+            else:
+                geom_types_on_data = get_gdf_geom_type(data, "geometry")
+                geom_type = GeomTypes.has_value(geom_types_on_data)
+                self.layers = self._build_layer(geom_type, title, data, from_epsg, tiled, cluster, time_column,
+                                                **style_parameters)
 
+    def _build_layer(self, geom_type: GeomTypes, title: str, data: gpd.GeoDataFrame, from_epsg: int,
+                     tiled: bool = False, cluster: bool = False, time_column: str | None = None,
+                     **style_parameters) -> LayerCore:
+        if time_column is not None:
+            if tiled or cluster:
+                raise Gdf2BokehError("temporal layers cannot be tiled or clustered")
             if geom_type == GeomTypes.POINT:
-                self.layers = PointLayer(title=title, data=data, from_epsg=from_epsg, **style_parameters)
+                layer_class = TemporalPointLayer
+            elif geom_type == GeomTypes.MULTIPOINT:
+                layer_class = TemporalMultiPointLayer
             elif geom_type == GeomTypes.LINESTRINGS:
-                self.layers = LinestringLayer(title=title, data=data, from_epsg=from_epsg, **style_parameters)
+                layer_class = TemporalLinestringLayer
+            else:
+                layer_class = TemporalPolygonLayer
+            style_parameters["time_column"] = time_column
+        elif cluster:
+            if geom_type not in (GeomTypes.POINT, GeomTypes.MULTIPOINT):
+                raise Gdf2BokehError(f"{geom_type.name} layers cannot be clustered")
+            layer_class = ClusteredPointLayer
+        elif tiled:
+            if geom_type == GeomTypes.LINESTRINGS:
+                layer_class = TiledLinestringLayer
             elif geom_type == GeomTypes.POLYGONS:
-                self.layers = PolygonLayer(title=title, data=data, from_epsg=from_epsg, **style_parameters)
-            elif geom_type == GeomTypes.MULTIPOINT:
-                self.layers = MultiPointLayer(title=title, data=data, from_epsg=from_epsg, **style_parameters)
+                layer_class = TiledPolygonLayer
             else:
-                raise ValueError(f"{geom_type} not supported")
+                raise Gdf2BokehError(f"{geom_type.name} layers cannot be tiled")
+        elif geom_type == GeomTypes.POINT:
+            layer_class = PointLayer
+        elif geom_type == GeomTypes.LINESTRINGS:
+            layer_class = LinestringLayer
+        elif geom_type == GeomTypes.POLYGONS:
+            layer_class = PolygonLayer
+        elif geom_type == GeomTypes.MULTIPOINT:
+            layer_class = MultiPointLayer
+        else:
+            raise ValueError(f"{geom_type} not supported")
+
+        return layer_class(title=title, data=data, from_epsg=from_epsg, budget=self._budget, lazy=self._lazy,
+                           **style_parameters)
+
+    def add_aggregated_layer(self, title: str, data: gpd.GeoDataFrame, from_epsg: int, cell_size: float,
+                             agg: Dict[str, str] | None = None, shape: str = BinShape.HEX, **style_parameters) -> None:
+        """
+        Add a layer aggregating a GeoDataframe on hexagons or squares
+
+        :param cell_size: cell size (map units, EPSG:3857): hexagon radius or square width
+        :type cell_size: float
+        :param agg: aggregation functions (pandas) by column, ex: {"value": "sum"}
+        :type agg: dict
+        :param shape: cells shape (hex, square)
+        :type shape: str
+        """
+        if self.is_df_empty(data):
+            raise Gdf2BokehError("GeoDataFrame is empty")
+
+        self.layers = AggregatedLayer(title=title, data=data, from_epsg=from_epsg, cell_size=cell_size, agg=agg,
+                                      shape=shape, budget=self._budget, lazy=self._lazy, **style_parameters)
+
+    def add_layer_from_arrow(self, title: str, data: "pyarrow.Table", from_epsg: int, geom_column: str = "geometry",
+                             **style_parameters) -> None:
+        """
+        Add layer from a pyarrow Table (pyarrow is required)
+
+        With a native geoarrow geometry encoding, the coordinates are read directly from the arrow buffers. WKB and
+        WKT geometries are converted to shapely geometries, then added as a GeoDataFrame.
+        """
+        from gdf2bokeh.arrow import ArrowLayer
+        from gdf2bokeh.arrow import GEOARROW_DEPTH
+        from gdf2bokeh.arrow import get_geoarrow_encoding
+
+        if data.num_rows == 0:
+            raise Gdf2BokehError("Table is empty")
+
+        encoding = get_geoarrow_encoding(data.schema.field(geom_column))
+        if encoding in GEOARROW_DEPTH:
+            self.layers = ArrowLayer(title=title, data=data, from_epsg=from_epsg, geom_column=geom_column,
+                                     budget=self._budget, lazy=self._lazy, **style_parameters)
+            return
+
+        geometries = data.column(geom_column).to_numpy()
+        if encoding == "geoarrow.wkb":
+            geometries = shapely.from_wkb(geometries)
+        else:
+            geometries = shapely.from_wkt(geometries)
+        data = gpd.GeoDataFrame(data.drop_columns([geom_column]).to_pandas(), geometry=geometries,
+                                crs=f"epsg:{from_epsg}")
+        self.add_layer_from_geodataframe(title, data, from_epsg, **style_parameters)
 
     def add_layer_from_dataframe(self, title: str, data: pd.DataFrame, from_epsg: int, geom_column: str = "geometry",
                                  geom_format: str = "shapely", **style_parameters) -> None:
@@ -8,3 +8,20 @@ class GeomFormat(str, Enum):
     # TODO maybe useless
     def __str__(self) -> str:
         return str.__str__(self)
+
+
+class BudgetPolicy(str, Enum):
+    ERROR = "error"
+    SIMPLIFY = "simplify"
+    WARN = "warn"
+
+    def __str__(self) -> str:
+        return str.__str__(self)
+
+
+class BinShape(str, Enum):
+    HEX = "hex"
+    SQUARE = "square"
+
+    def __str__(self) -> str:
+        return str.__str__(self)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Tuple
+
+import numpy as np
+import shapely
+
+if TYPE_CHECKING:
+    import geopandas as gpd
+
+# WGS84 semi-major axis, the sphere radius of the web mercator projection
+EARTH_RADIUS: float = 6378137.0
+# latitude of the web mercator world bounds (a square world)
+MAX_LATITUDE: float = 85.0511287798066
+
+WGS84_EPSG: int = 4326
+WEB_MERCATOR_EPSG: int = 3857
+
+
+def lonlat_to_web_mercator(lon: np.ndarray, lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    lonlat_to_web_mercator
+
+    To project longitudes/latitudes (EPSG:4326) on web mercator (EPSG:3857) with the spherical mercator formulas.
+    Latitudes are clamped to the web mercator world bounds.
+
+    :type lon: np.ndarray, degrees
+    :type lat: np.ndarray, degrees
+
+    :return: x, y (meters)
+    """
+    lat = np.clip(lat, -MAX_LATITUDE, MAX_LATITUDE)
+    x = np.radians(lon) * EARTH_RADIUS
+    y = np.log(np.tan(np.pi / 4 + np.radians(lat) / 2)) * EARTH_RADIUS
+    return x, y
+
+
+def _transform_lonlat(coordinates: np.ndarray) -> np.ndarray:
+    # the z coordinates (3rd column), if any, are kept
+    projected = coordinates.copy()
+    projected[:, 0], projected[:, 1] = lonlat_to_web_mercator(coordinates[:, 0], coordinates[:, 1])
+    return projected
+
+
+def get_epsg(data: gpd.GeoDataFrame) -> int | None:
+    """the EPSG code of the GeoDataFrame CRS, if any"""
+    if data.crs is None:
+        return None
+    return data.crs.to_epsg()
+
+
+def to_web_mercator(data: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """
+    to_web_mercator
+
+    To reproject a GeoDataFrame on EPSG:3857. From EPSG:4326 the coordinates are projected with NumPy
+    (shapely.transform), and from EPSG:3857 the data is returned as it is; the other CRS go through to_crs (pyproj).
+    The z coordinates are kept, as to_crs does.
+
+    :type data: gpd.GeoDataFrame
+
+    :return: gpd.GeoDataFrame
+    """
+    epsg = get_epsg(data)
+    if epsg == WEB_MERCATOR_EPSG:
+        return data
+    if epsg != WGS84_EPSG:
+        return data.to_crs(epsg=WEB_MERCATOR_EPSG)
+
+    geometries = data.geometry.values
+    has_z = shapely.has_z(geometries)
+    include_z = bool(has_z.any())
+    if (
+        ((shapely.get_type_id(geometries) == shapely.GeometryType.POINT) & ~shapely.is_empty(geometries)).all()
+        and (has_z.all() or not include_z)
+    ):
+        # building the points from the coordinates is faster than updating their copies
+        projected = shapely.points(_transform_lonlat(shapely.get_coordinates(geometries, include_z=include_z)))
+    else:
+        projected = shapely.transform(geometries, _transform_lonlat, include_z=include_z)
+    # a shallow copy: only the geometry column is replaced
+    data = data.copy(deep=False)
+    data[data.geometry.name] = projected
+    return data.set_crs(epsg=WEB_MERCATOR_EPSG, allow_override=True)
@@ -0,0 +1,41 @@
+from typing import Any
+from typing import Dict
+
+import shapely
+from shapely.geometry import Point
+from shapely.geometry import Polygon
+from shapely.geometry import box
+
+
+class SelectionGeometryError(Exception):
+    pass
+
+
+def selection_to_geometry(geometry: Dict[str, Any]) -> shapely.Geometry:
+    """
+    selection_to_geometry
+
+    To convert the geometry of a bokeh SelectionGeometry event (box, lasso or tap selection) into a shapely
+    geometry, in map coordinates. A self-intersecting lasso is made valid, a lasso of less than 3 vertices gives an
+    empty polygon (nothing selected).
+
+    :type geometry: dict, the event geometry
+
+    :return: shapely.Geometry
+    """
+    geometry_type = geometry.get("type")
+    if geometry_type == "rect":
+        return box(
+            min(geometry["x0"], geometry["x1"]), min(geometry["y0"], geometry["y1"]),
+            max(geometry["x0"], geometry["x1"]), max(geometry["y0"], geometry["y1"]),
+        )
+    if geometry_type == "poly":
+        vertices = list(zip(geometry["x"], geometry["y"]))
+        if len(vertices) < 3:
+            # a degenerate lasso selects nothing
+            return Polygon()
+        # a lasso can cross itself
+        return shapely.make_valid(Polygon(vertices))
+    if geometry_type == "point":
+        return Point(geometry["x"], geometry["y"])
+    raise SelectionGeometryError(f"{geometry_type} selection not supported")
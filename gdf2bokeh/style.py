@@ -0,0 +1,105 @@
+from typing import List
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+
+from bokeh import palettes
+from bokeh.core.property.vectorization import Field
+from bokeh.models import CategoricalColorMapper
+from bokeh.transform import factor_cmap
+from bokeh.transform import linear_cmap
+
+Palette = str | Sequence[str]
+
+DEFAULT_LINEAR_PALETTE: str = "Viridis256"
+
+
+class StyleError(Exception):
+    pass
+
+
+def is_categorical(values: Sequence) -> bool:
+    """numeric columns are mapped on a color range, the others on color categories"""
+    return np.asarray(values).dtype.kind not in "iuf"
+
+
+def to_categories(values: Sequence) -> List[str | None]:
+    """the categories of a column as strings (bool, dates...), as the factors of a color mapper; missing values: None"""
+    # loaded with the data: the layers are imported without pandas
+    import pandas as pd
+
+    return [None if pd.isna(value) else value if isinstance(value, str) else str(value) for value in values]
+
+
+def get_factors(values: Sequence) -> List[str]:
+    """the sorted categories of a column, missing values excluded"""
+    return sorted({value for value in to_categories(values) if value is not None})
+
+
+def get_palette(palette: Palette | None, colors_count: int) -> List[str]:
+    """
+    get_palette
+
+    To get `colors_count` colors from a palette: a bokeh palette family (Category10...) or name (Viridis256...), or
+    a list of colors. The colors are repeated if the palette is too short.
+    Default: Category10, Category20, then Turbo for more than 20 colors.
+
+    :type palette: str or list of str
+    :type colors_count: int
+
+    :return: list of colors
+    """
+    colors_count = max(colors_count, 1)
+    if palette is None:
+        palette = "Category10" if colors_count <= 10 else "Category20" if colors_count <= 20 else "Turbo256"
+
+    if isinstance(palette, str):
+        if palette in palettes.all_palettes:
+            sizes = palettes.all_palettes[palette]
+            colors = sizes[min(max(colors_count, min(sizes)), max(sizes))]
+        elif hasattr(palettes, palette):
+            colors = getattr(palettes, palette)
+            if len(colors) > colors_count:
+                return list(palettes.linear_palette(colors, colors_count))
+        else:
+            raise StyleError(f"{palette} palette not found")
+    else:
+        colors = palette
+
+    return [colors[position % len(colors)] for position in range(colors_count)]
+
+
+def build_color_transform(column: str, values: Sequence, palette: Palette | None = None,
+                          style_range: Tuple[float, float] | None = None) -> Field:
+    """
+    build_color_transform
+
+    To build the color transform of a glyph from a column: factor_cmap for categories, linear_cmap for numeric
+    values. Without range, the linear mapper bounds follow the data source values. The categories which are not
+    strings are converted (see to_categories): the data source column must be converted the same way.
+
+    :type column: str
+    :type values: the column values
+    :type palette: str or list of str
+    :type style_range: tuple of float, low and high bounds of the linear mapper
+
+    :return: Field, a color specification
+    """
+    if is_categorical(values):
+        factors = get_factors(values)
+        return factor_cmap(column, get_palette(palette, len(factors)), factors)
+
+    low, high = style_range or (None, None)
+    return linear_cmap(column, palette or DEFAULT_LINEAR_PALETTE, low=low, high=high)
+
+
+def update_color_transform(color_transform: Field, values: Sequence, palette: Palette | None = None) -> None:
+    """To update the categories of a color transform from the new values of its column"""
+    mapper = color_transform.transform
+    if not isinstance(mapper, CategoricalColorMapper):
+        return
+
+    factors = get_factors(values)
+    if factors != list(mapper.factors):
+        mapper.update(factors=factors, palette=get_palette(palette, len(factors)))
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from bokeh.models import CDSView
+from bokeh.models import CustomJS
+from bokeh.models import CustomJSFilter
+from bokeh.models import Slider
+
+from gdf2bokeh.layer import LayerCore
+from gdf2bokeh.layer import LinestringLayer
+from gdf2bokeh.layer import MultiPointLayer
+from gdf2bokeh.layer import PointLayer
+from gdf2bokeh.layer import PolygonLayer
+
+if TYPE_CHECKING:
+    import geopandas as gpd
+
+# the view only receives the rows range displayed: the indices are built by the browser
+_ROWS_RANGE_FILTER_CODE = """
+const indices = new Array(Math.max(end - start, 0))
+for (let i = 0; i < indices.length; i++) {
+    indices[i] = start + i
+}
+return indices
+"""
+_SLIDER_CODE = """
+const step = Math.min(Math.max(cb_obj.value, 0), offsets.length - 2)
+filter.args = {start: offsets[step], end: offsets[Math.min(step + window, offsets.length - 1)]}
+"""
+
+
+class TemporalLayer(LayerCore):
+    """
+    Base of the layers whose features are displayed by time step: the data is sorted on its time (or step) column
+    once, and the rows offsets of each step are precomputed. Displaying a step, or a time range, only sends the rows
+    range to the view of the renderer: the data source is not rebuilt.
+    """
+    _current_step = 0
+    _window = 1
+    _playback_callback = None
+    _slider = None
+    _slider_callback = None
+
+    def __init__(self, title: str, data: gpd.GeoDataFrame, from_epsg: int, time_column: str,
+                 **style_parameters) -> None:
+        """
+        :param time_column: the column holding the time (or the step) of the features
+        :type time_column: str
+        """
+        self._time_column = time_column
+        self._times = np.array([])
+        self._steps = np.array([])
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._filter = CustomJSFilter(args={"start": 0, "end": 0}, code=_ROWS_RANGE_FILTER_CODE)
+        super().__init__(title=title, data=data, from_epsg=from_epsg, **style_parameters)
+        self._style_parameters["view"] = CDSView(filter=self._filter)
+
+    @property
+    def steps(self) -> np.ndarray:
+        """the distinct values of the time column, sorted"""
+        self._materialize()
+        return self._steps
+
+    @property
+    def current_step(self) -> int:
+        return self._current_step
+
+    @property
+    def visible_rows(self) -> slice:
+        """the data source rows displayed"""
+        self._materialize()
+        return slice(self._filter.args["start"], self._filter.args["end"])
+
+    def _clean_data(self, data: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        data = super()._clean_data(data)
+        data = data.loc[data[self._time_column].notna()]
+        return data.sort_values(self._time_column, kind="stable")
+
+    def _on_data_source_updated(self) -> None:
+        super()._on_data_source_updated()
+        self._index_steps()
+
+    def _index_steps(self) -> None:
+        """To compute the rows offsets of each step, the data being sorted on the time column"""
+        self._times = self._data[self._time_column].to_numpy()
+        self._steps, offsets = np.unique(self._times, return_index=True)
+        self._offsets = np.append(offsets, self._times.shape[0]).astype(np.int64)
+        if self._slider_callback is not None:
+            self._slider_callback.args = {**self._slider_callback.args, "offsets": self._offsets.tolist()}
+            self._slider.end = max(self._steps.shape[0] - 1, 1)
+        self.set_step(min(self._current_step, max(self._steps.shape[0] - 1, 0)), self._window)
+
+    def _set_rows(self, start: int, end: int) -> None:
+        self._filter.args = {"start": int(start), "end": int(end)}
+
+    def set_step(self, step: int, window: int = 1) -> None:
+        """
+        To display a step (by its position in `steps`)
+
+        :param step: the step position
+        :type step: int
+        :param window: how many consecutive steps are displayed from this step
+        :type window: int
+        """
+        self._materialize()
+        steps_count = self._steps.shape[0]
+        self._current_step = step = min(max(step, 0), max(steps_count - 1, 0))
+        self._window = window
+        self._set_rows(self._offsets[step], self._offsets[min(step + window, steps_count)])
+        if self._slider_callback is not None:
+            # the slider follows the step displayed, and its window
+            if self._slider_callback.args["window"] != window:
+                self._slider_callback.args = {**self._slider_callback.args, "window": window}
+            if self._slider.value != step:
+                self._slider.value = step
+
+    def _on_slider_change(self, attr: str, old: int, new: int) -> None:
+        """the step chosen with the slider, on a bokeh server"""
+        if new != self._current_step:
+            self.set_step(new, self._window)
+
+    def _to_time(self, value: Any) -> Any:
+        """To convert a time range bound to the type of the time column"""
+        dtype = self._data[self._time_column].dtype
+        if isinstance(dtype, pd.DatetimeTZDtype):
+            # the tz-aware times are Timestamp objects: the naive bounds are in the time zone of the column
+            value = pd.Timestamp(value)
+            return value.tz_localize(dtype.tz) if value.tzinfo is None else value.tz_convert(dtype.tz)
+        return np.asarray(value, dtype=self._times.dtype)
+
+    def set_range(self, start: Any, end: Any) -> None:
+        """To display the features whose time is between start and end (both included)"""
+        self._materialize()
+        self._set_rows(
+            np.searchsorted(self._times, self._to_time(start), side="left"),
+            np.searchsorted(self._times, self._to_time(end), side="right"),
+        )
+
+    def next_step(self, loop: bool = True) -> None:
+        """To display the next step, or the first one after the last step if loop is True"""
+        step = self._current_step + 1
+        if step >= self._steps.shape[0]:
+            if not loop:
+                self.stop()
+                return
+            step = 0
+        self.set_step(step, self._window)
+
+    @property
+    def is_playing(self) -> bool:
+        return self._playback_callback is not None
+
+    def play(self, interval: int = 100, window: int | None = None, loop: bool = True) -> None:
+        """
+        To animate the steps on a bokeh server: a step is displayed every `interval` milliseconds
+
+        :param interval: delay (ms) between two steps
+        :type interval: int
+        :param window: how many consecutive steps are displayed, default: the current window
+        :type window: int
+        :param loop: if True, the playback restarts from the first step after the last one, otherwise it stops
+        :type loop: bool
+        """
+        from bokeh.io import curdoc
+
+        self.stop()
+        if window is not None:
+            self._window = window
+        document = self._data_source.document or curdoc()
+        self._playback_callback = (
+            document, document.add_periodic_callback(lambda: self.next_step(loop), interval)
+        )
+
+    def stop(self) -> None:
+        """To stop the playback"""
+        if self._playback_callback is None:
+            return
+        document, callback = self._playback_callback
+        self._playback_callback = None
+        document.remove_periodic_callback(callback)
+
+    def slider(self, **slider_parameters) -> Slider:
+        """
+        To build a slider selecting the step displayed. It is linked in the browser (CustomJS), so it works on a
+        standalone document too. On a bokeh server, the slider and the layer steps (set_step, play...) are synced.
+        """
+        self._materialize()
+        slider = Slider(start=0, end=max(self._steps.shape[0] - 1, 1), value=self._current_step, step=1,
+                        **{"title": self.title, **slider_parameters})
+        self._slider_callback = CustomJS(
+            args={"filter": self._filter, "offsets": self._offsets.tolist(), "window": self._window},
+            code=_SLIDER_CODE,
+        )
+        slider.js_on_change("value", self._slider_callback)
+        slider.on_change("value", self._on_slider_change)
+        self._slider = slider
+        return slider
+
+
+class TemporalPointLayer(TemporalLayer, PointLayer):
+    pass
+
+
+class TemporalMultiPointLayer(TemporalLayer, MultiPointLayer):
+    pass
+
+
+class TemporalLinestringLayer(TemporalLayer, LinestringLayer):
+    pass
+
+
+class TemporalPolygonLayer(TemporalLayer, PolygonLayer):
+    pass
@@ -0,0 +1,292 @@
+import math
+import os
+import pickle
+import shutil
+import tempfile
+from functools import lru_cache
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Set
+from typing import Tuple
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from bokeh.events import RangesUpdate
+from bokeh.plotting import figure
+
+from gdf2bokeh.layer import LayerCore
+from gdf2bokeh.layer import LinestringLayer
+from gdf2bokeh.layer import PolygonLayer
+
+# half of the web mercator world width
+WEB_MERCATOR_EXTENT: float = 20037508.342789244
+
+TileKey = Tuple[int, int, int]
+Viewport = Tuple[float, float, float, float, int]
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """
+    tile_bounds
+
+    To get the web mercator bounds of a z/x/y tile (y from the top of the world)
+
+    :return: x_min, y_min, x_max, y_max
+    """
+    span = 2 * WEB_MERCATOR_EXTENT / 2 ** z
+    return (
+        -WEB_MERCATOR_EXTENT + x * span,
+        WEB_MERCATOR_EXTENT - (y + 1) * span,
+        -WEB_MERCATOR_EXTENT + (x + 1) * span,
+        WEB_MERCATOR_EXTENT - y * span,
+    )
+
+
+def tile_resolution(z: int, tile_size: int = 256) -> float:
+    """map units covered by a pixel at the zoom level z"""
+    return 2 * WEB_MERCATOR_EXTENT / (tile_size * 2 ** z)
+
+
+def zoom_for_viewport(x_start: float, x_end: float, width: int, tile_size: int = 256) -> int:
+    """To find the zoom level matching the width (pixels) of a map displaying [x_start, x_end]"""
+    resolution = abs(x_end - x_start) / max(width, 1)
+    if resolution == 0:
+        return 0
+    return max(math.floor(math.log2(2 * WEB_MERCATOR_EXTENT / (tile_size * resolution))), 0)
+
+
+def tiles_for_bounds(z: int, x_min: float, y_min: float, x_max: float, y_max: float
+                     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """To get the tiles range (x_start, x_end, y_start, y_end, all included) covering the bounds at zoom z"""
+    tiles_count = 2 ** z
+    span = 2 * WEB_MERCATOR_EXTENT / tiles_count
+    return (
+        np.clip(np.floor((np.asarray(x_min) + WEB_MERCATOR_EXTENT) / span), 0, tiles_count - 1).astype(np.int64),
+        np.clip(np.floor((np.asarray(x_max) + WEB_MERCATOR_EXTENT) / span), 0, tiles_count - 1).astype(np.int64),
+        np.clip(np.floor((WEB_MERCATOR_EXTENT - np.asarray(y_max)) / span), 0, tiles_count - 1).astype(np.int64),
+        np.clip(np.floor((WEB_MERCATOR_EXTENT - np.asarray(y_min)) / span), 0, tiles_count - 1).astype(np.int64),
+    )
+
+
+class TilePyramid:
+    """
+    A z/x/y web mercator tile pyramid cut from a GeoDataFrame (EPSG:3857)
+
+    The tiles are built on demand, when they are read: the features intersecting a tile are found with a spatial
+    index, clipped around the tile, simplified with a tolerance of one pixel, then clipped on the tile with
+    shapely.clip_by_rect. The features crossing several tiles are split: the clipped parts keep the attributes of
+    their feature. The tiles built are kept in memory, or pickled in a directory of their own in `storage_dir`
+    (several pyramids can share it), and the tiles read are cached (LRU).
+    """
+    # the features are clipped with this margin (pixels) before their simplification: the tile borders are not
+    # simplified
+    __CLIP_MARGIN: int = 2
+
+    def __init__(self, data: gpd.GeoDataFrame, min_zoom: int = 0, max_zoom: int = 12, tile_size: int = 256,
+                 storage_dir: str | None = None, cache_size: int = 128) -> None:
+        """
+        :param data: the data to cut, projected on EPSG:3857
+        :type data: gpd.GeoDataFrame
+        :param min_zoom: first zoom level served
+        :type min_zoom: int
+        :param max_zoom: last zoom level served, the data is served at this level when zooming further
+        :type max_zoom: int
+        :param tile_size: tile size (pixels)
+        :type tile_size: int
+        :param storage_dir: directory where the tiles directory of the pyramid is created, default: in memory
+        :type storage_dir: str
+        :param cache_size: how many tiles are cached
+        :type cache_size: int
+        """
+        self.data = data
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.tile_size = tile_size
+        self._storage_dir = None
+        # the tiles built containing data (None when stored on disk), and the empty tiles built
+        self._tiles: Dict[TileKey, Tuple[np.ndarray, np.ndarray] | None] = {}
+        self._empty_tiles: Set[TileKey] = set()
+        self.get_tile = lru_cache(maxsize=cache_size)(self._read_tile)
+
+        if storage_dir is not None:
+            os.makedirs(storage_dir, exist_ok=True)
+            self._storage_dir = tempfile.mkdtemp(prefix="tiles_", dir=storage_dir)
+
+        geometries = data.geometry.values
+        self._valid_index = np.flatnonzero(~(shapely.is_missing(geometries) | shapely.is_empty(geometries)))
+        self._spatial_index = shapely.STRtree(geometries[self._valid_index])
+        self._dimension = (
+            shapely.get_dimensions(geometries[self._valid_index]).max() if self._valid_index.shape[0] > 0 else -1
+        )
+
+    @property
+    def tiles(self) -> List[TileKey]:
+        """the keys of the tiles built containing data"""
+        return list(self._tiles)
+
+    def clear(self) -> None:
+        """To remove the tiles, and their directory if they are stored on disk"""
+        self._tiles = {}
+        self._empty_tiles = set()
+        self.get_tile.cache_clear()
+        if self._storage_dir is not None:
+            shutil.rmtree(self._storage_dir, ignore_errors=True)
+
+    def _build_tile(self, key: TileKey) -> Tuple[np.ndarray, np.ndarray]:
+        """To cut the features of a tile: their rows and their clipped parts"""
+        bounds = tile_bounds(*key)
+        rows = np.sort(self._valid_index[self._spatial_index.query(shapely.box(*bounds))])
+        if rows.shape[0] == 0:
+            return rows, np.empty(0, dtype=object)
+
+        tolerance = tile_resolution(key[0], self.tile_size)
+        margin = self.__CLIP_MARGIN * tolerance
+        # only the parts of the features around the tile are simplified
+        around = shapely.clip_by_rect(
+            self.data.geometry.values[rows], bounds[0] - margin, bounds[1] - margin, bounds[2] + margin,
+            bounds[3] + margin
+        )
+        clipped = shapely.clip_by_rect(shapely.simplify(around, tolerance, preserve_topology=True), *bounds)
+        # clipping can return lower dimension parts (a polygon touching the tile border...)
+        parts, parts_index = shapely.get_parts(clipped, return_index=True)
+        is_kept = shapely.get_dimensions(parts) == self._dimension
+        return rows[parts_index[is_kept]], parts[is_kept]
+
+    def _tile_path(self, key: TileKey) -> str:
+        return os.path.join(self._storage_dir, "{}_{}_{}.pkl".format(*key))
+
+    def _write_tile(self, key: TileKey, rows: np.ndarray, geometries: np.ndarray) -> None:
+        if rows.shape[0] == 0:
+            self._empty_tiles.add(key)
+            return
+
+        if self._storage_dir is None:
+            self._tiles[key] = (rows, geometries)
+            return
+
+        with open(self._tile_path(key), "wb") as output_file:
+            pickle.dump((rows, shapely.to_wkb(geometries)), output_file)
+        self._tiles[key] = None
+
+    def _read_tile(self, z: int, x: int, y: int) -> gpd.GeoDataFrame:
+        key = (z, x, y)
+        if key in self._empty_tiles:
+            return self.data.iloc[:0]
+
+        if key not in self._tiles:
+            rows, geometries = self._build_tile(key)
+            self._write_tile(key, rows, geometries)
+        elif self._storage_dir is None:
+            rows, geometries = self._tiles[key]
+        else:
+            with open(self._tile_path(key), "rb") as input_file:
+                rows, geometries = pickle.load(input_file)
+            geometries = shapely.from_wkb(geometries)
+
+        return self.data.iloc[rows].set_geometry(geometries, crs=self.data.crs)
+
+    def get_viewport(self, x_start: float, x_end: float, y_start: float, y_end: float, width: int
+                     ) -> gpd.GeoDataFrame:
+        """To get the data of the tiles visible on a map, at the zoom level matching its width (pixels)"""
+        if self._valid_index.shape[0] == 0:
+            return self.data.iloc[:0]
+        z = min(max(zoom_for_viewport(x_start, x_end, width, self.tile_size), self.min_zoom), self.max_zoom)
+        tiles_x_start, tiles_x_end, tiles_y_start, tiles_y_end = tiles_for_bounds(
+            z, min(x_start, x_end), min(y_start, y_end), max(x_start, x_end), max(y_start, y_end)
+        )
+        tiles = [
+            tile
+            for x in range(tiles_x_start, tiles_x_end + 1)
+            for y in range(tiles_y_start, tiles_y_end + 1)
+            if (tile := self.get_tile(z, x, y)).shape[0] > 0
+        ]
+        if len(tiles) == 0:
+            return self.data.iloc[:0]
+        return gpd.GeoDataFrame(pd.concat(tiles), geometry=self.data.geometry.name, crs=self.data.crs)
+
+
+class ViewportLayer(LayerCore):
+    """
+    Base of the layers whose data source depends on the visible extent of the map: the extent is sent by the
+    RangesUpdate event of the figure (bokeh server).
+    """
+    _viewport: Viewport | None = None
+    _SELECTABLE: bool = False
+    _BUDGETED: bool = False
+
+    def _watch_viewport(self, figure_obj: figure) -> None:
+        figure_obj.on_event(RangesUpdate, lambda event: self._on_ranges_update(event, figure_obj.width))
+
+    def _on_ranges_update(self, event: RangesUpdate, width: int) -> None:
+        self._viewport = (event.x0, event.x1, event.y0, event.y1, width)
+        self.refresh_data_source()
+
+
+class TiledLayer(ViewportLayer):
+    """
+    Base of the layers served by tiles: only the tiles visible on the map, at the matching zoom level, are loaded on
+    its data source.
+    """
+    _pyramid: TilePyramid | None = None
+
+    def __init__(self, title: str, data: gpd.GeoDataFrame, from_epsg: int, min_zoom: int = 0, max_zoom: int = 12,
+                 tiles_dir: str | None = None, tiles_cache_size: int = 128, **style_parameters) -> None:
+        """
+        :param min_zoom: first zoom level of the tile pyramid
+        :type min_zoom: int
+        :param max_zoom: last zoom level of the tile pyramid
+        :type max_zoom: int
+        :param tiles_dir: directory where the tiles of the layer are stored (in a directory of their own), default:
+            in memory
+        :type tiles_dir: str
+        :param tiles_cache_size: how many tiles are cached
+        :type tiles_cache_size: int
+        """
+        self._pyramid_parameters = {
+            "min_zoom": min_zoom,
+            "max_zoom": max_zoom,
+            "storage_dir": tiles_dir,
+            "cache_size": tiles_cache_size,
+        }
+        super().__init__(title=title, data=data, from_epsg=from_epsg, **style_parameters)
+
+    @property
+    def pyramid(self) -> TilePyramid:
+        self._materialize()
+        return self._pyramid
+
+    def _prepare_projected_data(self, data: gpd.GeoDataFrame) -> Tuple[gpd.GeoDataFrame, Dict[str, Any]]:
+        data, derived = super()._prepare_projected_data(data)
+        # the pyramid is set on the layer with the data (the conversion can run on a thread)
+        return data, {**derived, "pyramid": TilePyramid(data, **self._pyramid_parameters)}
+
+    def _set_derived_data(self, derived: Dict[str, Any]) -> None:
+        super()._set_derived_data(derived)
+        previous_pyramid, self._pyramid = self._pyramid, derived["pyramid"]
+        if previous_pyramid is not None and previous_pyramid is not self._pyramid:
+            previous_pyramid.clear()
+
+    def _to_data_source_data(self, data: gpd.GeoDataFrame, derived: Dict[str, Any]) -> Dict[str, list]:
+        pyramid = derived["pyramid"]
+        if self._viewport is None:
+            # the map extent is unknown: the whole data at the first zoom level
+            data = pyramid.get_viewport(*data.total_bounds[[0, 2, 1, 3]], width=pyramid.tile_size)
+        else:
+            data = pyramid.get_viewport(*self._viewport)
+        return dict(self._format_gdf_features_to_bokeh(data).data)
+
+    def render(self, figure_obj: figure) -> None:
+        super().render(figure_obj)
+        self._watch_viewport(figure_obj)
+
+
+class TiledLinestringLayer(TiledLayer, LinestringLayer):
+    pass
+
+
+class TiledPolygonLayer(TiledLayer, PolygonLayer):
+    pass
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+import numpy as np
+import shapely
+
+
+class Topology:
+    """
+    Polygons encoded as arcs shared between rings (as TopoJSON): a boundary shared by neighbouring polygons is
+    stored once, and simplified once, so the polygons rebuilt from the simplified arcs stay gap-free.
+
+    A ring is a list of arc references: the arc position, or its complement (~position) when the arc is read
+    backwards.
+    """
+
+    def __init__(self, arcs: List[np.ndarray], rings: List[List[int]], ring_parts: np.ndarray,
+                 part_features: np.ndarray, features_type: np.ndarray) -> None:
+        """
+        :param arcs: arcs coordinates, (n, 2) arrays
+        :type arcs: list of np.ndarray
+        :param rings: arc references of each ring, the exterior ring of a polygon first
+        :type rings: list of list of int
+        :param ring_parts: polygon (part) index of each ring
+        :type ring_parts: np.ndarray
+        :param part_features: feature index of each polygon (part)
+        :type part_features: np.ndarray
+        :param features_type: shapely geometry type id of each feature
+        :type features_type: np.ndarray
+        """
+        self.arcs = arcs
+        self.rings = rings
+        self.ring_parts = ring_parts
+        self.part_features = part_features
+        self.features_type = features_type
+
+    @property
+    def vertices_count(self) -> int:
+        """the vertices stored by the arcs"""
+        return sum(arc.shape[0] for arc in self.arcs)
+
+    def simplify(self, tolerance: float) -> Topology:
+        """To simplify each arc once (Douglas-Peucker keeps their ends, the junctions between rings)"""
+        if len(self.arcs) == 0:
+            return self
+        arcs_size = [arc.shape[0] for arc in self.arcs]
+        lines = shapely.linestrings(np.concatenate(self.arcs), indices=np.repeat(np.arange(len(self.arcs)), arcs_size))
+        simplified = shapely.simplify(lines, tolerance, preserve_topology=True)
+        return Topology(
+            [shapely.get_coordinates(arc) for arc in simplified], self.rings, self.ring_parts, self.part_features,
+            self.features_type,
+        )
+
+    def _ring_coordinates(self, ring: List[int]) -> np.ndarray:
+        pieces = [self.arcs[arc] if arc >= 0 else self.arcs[~arc][::-1] for arc in ring]
+        # consecutive arcs share their junction vertex
+        return np.concatenate([pieces[0]] + [piece[1:] for piece in pieces[1:]])
+
+    def to_geometries(self) -> np.ndarray:
+        """
+        To rebuild the features from the arcs references. The rings collapsed by the simplification are dropped
+        (with their polygon if it is an exterior ring).
+
+        :return: np.ndarray of shapely geometries, the features type is kept
+        """
+        features_count = self.features_type.shape[0]
+        rings_coordinates = [self._ring_coordinates(ring) for ring in self.rings]
+        is_valid_ring = np.array([coordinates.shape[0] >= 4 for coordinates in rings_coordinates], dtype=bool)
+
+        # a polygon is dropped with its exterior ring (its first one)
+        first_rings = np.ones(self.ring_parts.shape[0], dtype=bool)
+        first_rings[1:] = self.ring_parts[1:] != self.ring_parts[:-1]
+        kept_parts = np.zeros(self.part_features.shape[0], dtype=bool)
+        kept_parts[self.ring_parts[first_rings & is_valid_ring]] = True
+        is_kept_ring = is_valid_ring & kept_parts[self.ring_parts]
+
+        kept_rings = np.flatnonzero(is_kept_ring)
+        coordinates = (
+            np.concatenate([rings_coordinates[ring] for ring in kept_rings])
+            if kept_rings.shape[0] > 0 else np.empty((0, 2))
+        )
+        ring_offsets = np.r_[0, np.cumsum([rings_coordinates[ring].shape[0] for ring in kept_rings])]
+        part_offsets = np.r_[0, np.cumsum(np.bincount(self.ring_parts[kept_rings],
+                                                      minlength=self.part_features.shape[0])[kept_parts])]
+        feature_offsets = np.r_[0, np.cumsum(np.bincount(self.part_features[kept_parts], minlength=features_count))]
+
+        geometries = shapely.from_ragged_array(
+            shapely.GeometryType.MULTIPOLYGON, coordinates,
+            (ring_offsets.astype(np.int64), part_offsets.astype(np.int64), feature_offsets.astype(np.int64)),
+        )
+        # the polygons stay polygons, empty if they have been dropped
+        is_polygon = self.features_type == shapely.GeometryType.POLYGON
+        parts_count = np.diff(feature_offsets)
+        geometries[is_polygon & (parts_count == 1)] = shapely.get_geometry(
+            geometries[is_polygon & (parts_count == 1)], 0
+        )
+        geometries[is_polygon & (parts_count == 0)] = shapely.Polygon()
+        return geometries
+
+
+def _find_junctions(vertex_ids: np.ndarray, ring_starts: np.ndarray, ring_sizes: np.ndarray,
+                    vertices_count: int) -> np.ndarray:
+    """the vertices where rings meet: their degree in the graph of the (unique) ring edges is not 2"""
+    positions = np.arange(vertex_ids.shape[0])
+    next_positions = positions + 1
+    ring_ends = ring_starts + ring_sizes - 1
+    next_positions[ring_ends] = ring_starts
+    edges = np.unique(np.sort(np.column_stack([vertex_ids, vertex_ids[next_positions]]), axis=1), axis=0)
+    return np.bincount(edges.ravel(), minlength=vertices_count) != 2
+
+
+def build_topology(geometries: np.ndarray) -> Topology:
+    """
+    build_topology
+
+    To extract the arcs shared by the rings of (multi)polygons: the rings are cut on the junctions, the vertices
+    where more than 2 boundaries meet. The shared vertices must be exactly equal, as on a tessellation.
+
+    :type geometries: np.ndarray of shapely polygons or multipolygons
+
+    :return: Topology
+    """
+    features_type = shapely.get_type_id(geometries)
+    parts, part_features = shapely.get_parts(shapely.remove_repeated_points(geometries), return_index=True)
+    rings, ring_parts = shapely.get_rings(parts, return_index=True)
+    coordinates, ring_index = shapely.get_coordinates(rings, return_index=True)
+    if coordinates.shape[0] == 0:
+        # no rings: the features are empty
+        return Topology([], [], ring_parts, part_features, features_type)
+
+    # rings as cycles: without their closing vertex
+    is_closing = np.r_[ring_index[1:] != ring_index[:-1], True]
+    coordinates, ring_index = coordinates[~is_closing], ring_index[~is_closing]
+    vertices, vertex_ids = np.unique(coordinates, axis=0, return_inverse=True)
+    vertex_ids = vertex_ids.ravel()
+    ring_sizes = np.bincount(ring_index, minlength=rings.shape[0])
+    ring_starts = np.r_[0, np.cumsum(ring_sizes)[:-1]]
+    is_junction = _find_junctions(vertex_ids, ring_starts, ring_sizes, vertices.shape[0])
+
+    arcs_by_key: Dict[Tuple[int, ...], int] = {}
+    arcs: List[np.ndarray] = []
+    topology_rings: List[List[int]] = []
+    for start, size in zip(ring_starts, ring_sizes):
+        ring = vertex_ids[start:start + size]
+        cuts = np.flatnonzero(is_junction[ring])
+        if cuts.shape[0] == 0:
+            # a boundary shared entirely (an island and its hole): both rings are cut on the same vertex
+            cuts = np.array([np.argmin(ring)])
+        ring = np.roll(ring, -cuts[0])
+        closed_ring = np.append(ring, ring[0])
+
+        references = []
+        for arc_start, arc_end in zip(cuts - cuts[0], np.append(cuts[1:] - cuts[0], size)):
+            forward = tuple(closed_ring[arc_start:arc_end + 1].tolist())
+            key = min(forward, forward[::-1])
+            arc = arcs_by_key.get(key)
+            if arc is None:
+                arc = arcs_by_key[key] = len(arcs)
+                arcs.append(vertices[list(key)])
+            references.append(arc if forward == key else ~arc)
+        topology_rings.append(references)
+
+    return Topology(arcs, topology_rings, ring_parts, part_features, features_type)
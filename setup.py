@@ -6,6 +6,11 @@ requirements = [
     "bokeh >=3.0.3"
 ]
 
+# optional: add_layer_from_arrow
+extras_requirements = {
+    "arrow": ["pyarrow >=14.0.0"]
+}
+
 setup_requirements = []
 
 test_requirements = []
@@ -18,6 +23,7 @@ setup(
     description="An easy way to map geodataframes on bokeh",
     entry_points={},
     install_requires=requirements,
+    extras_require=extras_requirements,
     license="BSD",
     long_description="",
     include_package_data=True,
@@ -0,0 +1,64 @@
+import pytest
+
+import geopandas as gpd
+from shapely.geometry import Point
+from shapely.geometry import Polygon
+from shapely.geometry import box
+
+from gdf2bokeh import Gdf2Bokeh
+from gdf2bokeh.aggregate import AggregatedLayer
+
+
+@pytest.fixture
+def valued_points_data() -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame(
+        {"value": [1, 2, 3, 10]},
+        geometry=[Point(1, 1), Point(2, 2), Point(3, 1), Point(150, 150)],
+        crs="epsg:3857",
+    )
+
+
+def test_hex_aggregated_layer(valued_points_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_aggregated_layer("layer_1", valued_points_data, from_epsg=3857, cell_size=10,
+                                     agg={"value": "sum"})
+    map_session.add_layers_on_maps()
+
+    layer = map_session.layers["layer_1"]
+    assert isinstance(layer, AggregatedLayer)
+    data = layer._data_source.data
+    assert sorted(data["value"].tolist()) == [6, 10]
+    assert sorted(data["count"].tolist()) == [1, 3]
+    assert set(data) == {"q", "r", "value", "count"}
+
+
+def test_square_aggregated_layer(valued_points_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_aggregated_layer("layer_1", valued_points_data, from_epsg=3857, cell_size=100, shape="square",
+                                     agg={"value": "mean"})
+    map_session.add_layers_on_maps()
+
+    data = map_session.layers["layer_1"]._data_source.data
+    assert data["value"].tolist() == [2, 10]
+    assert data["left"].tolist() == [0, 100]
+    assert data["top"].tolist() == [100, 200]
+
+
+def test_aggregated_layer_from_polygons():
+    data = gpd.GeoDataFrame(geometry=[box(0, 0, 10, 10), box(0, 0, 20, 20)], crs="epsg:3857")
+    map_session = Gdf2Bokeh()
+    map_session.add_aggregated_layer("layer_1", data, from_epsg=3857, cell_size=100, shape="square")
+
+    # binned from their centroids
+    assert map_session.layers["layer_1"]._data_source.data["count"].tolist() == [2]
+
+
+def test_aggregated_layer_empty_geometries():
+    data = gpd.GeoDataFrame({"value": [1, 2, 3]}, geometry=[box(0, 0, 10, 10), Polygon(), None], crs="epsg:3857")
+    map_session = Gdf2Bokeh()
+    map_session.add_aggregated_layer("layer_1", data, from_epsg=3857, cell_size=100, agg={"value": "sum"})
+
+    # the features without geometry are not binned
+    data_source_data = map_session.layers["layer_1"]._data_source.data
+    assert data_source_data["count"].tolist() == [1]
+    assert data_source_data["value"].tolist() == [1]
@@ -0,0 +1,85 @@
+import pytest
+
+import numpy as np
+
+from gdf2bokeh import Gdf2Bokeh
+
+# pyarrow is an optional dependency (arrow extra)
+pa = pytest.importorskip("pyarrow")
+
+from gdf2bokeh.arrow import ArrowLayer  # noqa: E402
+from gdf2bokeh.arrow import read_geoarrow_buffers  # noqa: E402
+
+
+def to_arrow(data, **kwargs) -> pa.Table:
+    return pa.table(data.to_arrow(**kwargs))
+
+
+def geodataframe_data_source(data, from_epsg=4326):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("layer", data, from_epsg=from_epsg)
+    return map_session.layers["layer"]._data_source.data
+
+
+@pytest.mark.parametrize("interleaved", [True, False])
+def test_read_geoarrow_buffers(linestrings_data, interleaved):
+    table = to_arrow(linestrings_data, geometry_encoding="geoarrow", interleaved=interleaved)
+    x, y, offsets = read_geoarrow_buffers(table.column("geometry"), "geoarrow.linestring")
+
+    assert len(offsets) == 1
+    assert offsets[0].shape[0] == linestrings_data.shape[0] + 1
+    assert x[offsets[0][0]:offsets[0][1]].tolist() == list(linestrings_data.geometry.iloc[0].xy[0])
+    assert y[offsets[0][0]:offsets[0][1]].tolist() == list(linestrings_data.geometry.iloc[0].xy[1])
+
+
+def test_from_arrow_points(points_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_arrow("layer_1", to_arrow(points_data, geometry_encoding="geoarrow"), from_epsg=4326,
+                                     size=6)
+    map_session.add_layers_on_maps()
+
+    layer = map_session.layers["layer_1"]
+    assert isinstance(layer, ArrowLayer)
+    assert layer.stats.vertices == points_data.shape[0]
+    expected = geodataframe_data_source(points_data)
+    assert np.allclose(layer._data_source.data["x"], expected["x"])
+    assert np.allclose(layer._data_source.data["y"], expected["y"])
+    assert set(layer._data_source.data) == set(expected)
+
+
+def test_from_arrow_multilines(multilines_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_arrow("layer_1", to_arrow(multilines_data, geometry_encoding="geoarrow"),
+                                     from_epsg=4326)
+
+    data = map_session.layers["layer_1"]._data_source.data
+    expected = geodataframe_data_source(multilines_data)
+    # exploded as the GeoDataFrame layer
+    assert len(data["x"]) == len(expected["x"])
+    for x_values, expected_x_values in zip(data["x"], expected["x"]):
+        assert np.allclose(x_values, expected_x_values)
+
+
+def test_from_arrow_multipolygons(multipolygons_data):
+    multipolygons_data = multipolygons_data.to_crs(3857)
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_arrow("layer_1", to_arrow(multipolygons_data, geometry_encoding="geoarrow"),
+                                     from_epsg=3857)
+
+    data = map_session.layers["layer_1"]._data_source.data
+    assert len(data["x"]) == multipolygons_data.shape[0]
+    last_geometry = multipolygons_data.geometry.iloc[-1]
+    assert len(data["x"][-1]) == len(last_geometry.geoms)
+    for polygon_x, polygon in zip(data["x"][-1], last_geometry.geoms):
+        assert len(polygon_x) == 1 + len(polygon.interiors)
+        # not projected: same coordinates
+        assert polygon_x[0].tolist() == list(polygon.exterior.xy[0])
+
+
+def test_from_arrow_wkb(polygons_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_arrow("layer_1", to_arrow(polygons_data), from_epsg=4326)
+
+    layer = map_session.layers["layer_1"]
+    assert not isinstance(layer, ArrowLayer)
+    assert layer.data.shape[0] == polygons_data.shape[0]
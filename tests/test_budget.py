@@ -0,0 +1,57 @@
+import pytest
+
+import shapely
+
+from gdf2bokeh import Gdf2Bokeh
+from gdf2bokeh import LayerBudget
+from gdf2bokeh.budget import LayerBudgetError
+
+
+def test_layer_stats(multipolygons_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("layer_1", multipolygons_data, from_epsg=4326)
+
+    stats = map_session.layers["layer_1"].stats
+    assert stats.features == 2
+    assert stats.vertices == shapely.get_num_coordinates(multipolygons_data.geometry.values).sum()
+    assert stats.coordinates_bytes == stats.vertices * 2 * 8
+    assert stats.estimated_bytes > stats.coordinates_bytes
+
+
+def test_budget_error(multipolygons_data):
+    map_session = Gdf2Bokeh(budget=LayerBudget(max_vertices=10))
+    with pytest.raises(LayerBudgetError):
+        map_session.add_layer_from_geodataframe("layer_1", multipolygons_data, from_epsg=4326)
+
+
+def test_budget_simplify(multipolygons_data):
+    vertices = shapely.get_num_coordinates(multipolygons_data.geometry.values).sum()
+    map_session = Gdf2Bokeh(budget=LayerBudget(max_vertices=vertices - 1, policy="simplify"))
+    map_session.add_layer_from_geodataframe("layer_1", multipolygons_data, from_epsg=4326)
+
+    stats = map_session.layers["layer_1"].stats
+    assert stats.vertices < vertices
+    assert stats.features == 2
+
+
+def test_budget_simplify_points(points_data):
+    map_session = Gdf2Bokeh(budget=LayerBudget(max_vertices=1, policy="simplify"))
+    with pytest.raises(LayerBudgetError):
+        map_session.add_layer_from_geodataframe("layer_1", points_data, from_epsg=4326)
+
+
+def test_budget_warn(points_data):
+    map_session = Gdf2Bokeh(budget=LayerBudget(max_bytes=1, policy="warn"))
+    with pytest.warns(UserWarning, match="layer_1"):
+        map_session.add_layer_from_geodataframe("layer_1", points_data, from_epsg=4326)
+    assert len(map_session.layers) == 1
+
+
+def test_budget_reduced_layers(points_data, multipolygons_data):
+    # the aggregated, clustered and tiled layers do not send the data features: the budget is skipped
+    map_session = Gdf2Bokeh(budget=LayerBudget(max_vertices=1))
+    map_session.add_aggregated_layer("layer_1", points_data, from_epsg=4326, cell_size=1e6)
+    map_session.add_layer_from_geodataframe("layer_2", points_data, from_epsg=4326, cluster=True)
+    map_session.add_layer_from_geodataframe("layer_3", multipolygons_data, from_epsg=4326, tiled=True, max_zoom=2)
+    assert len(map_session.layers) == 3
+    assert map_session.layers["layer_2"].stats.features == points_data.shape[0]
@@ -0,0 +1,103 @@
+import pytest
+
+import geopandas as gpd
+import numpy as np
+from shapely.geometry import Point
+
+from bokeh.events import RangesUpdate
+
+from gdf2bokeh import Gdf2Bokeh
+from gdf2bokeh.cluster import ClusteredPointLayer
+from gdf2bokeh.cluster import PointClusters
+from gdf2bokeh.main import Gdf2BokehError
+
+
+@pytest.fixture
+def clustered_points_data() -> gpd.GeoDataFrame:
+    # 2 groups of points, 1km apart
+    return gpd.GeoDataFrame(
+        {"name": ["a1", "a2", "a3", "b1", "b2"]},
+        geometry=[Point(0, 0), Point(1, 1), Point(2, 0), Point(1000, 1000), Point(1001, 1000)],
+        crs="epsg:3857",
+    )
+
+
+def test_point_clusters(clustered_points_data):
+    clusters = PointClusters(clustered_points_data, max_zoom=18)
+
+    # the whole world in a cell
+    assert clusters.get_level(0).count.tolist() == [5]
+    assert clusters.get_level(0).x[0] == pytest.approx(2004 / 5)
+    # the 2 groups
+    assert sorted(clusters.get_level(14).count.tolist()) == [2, 3]
+    # the points beyond the last zoom level
+    assert clusters.get_level(19).count.tolist() == [1] * 5
+    assert clusters.get_level(19).row.tolist() == list(range(5))
+
+
+def test_point_clusters_hierarchy(clustered_points_data):
+    clusters = PointClusters(clustered_points_data, max_zoom=18)
+
+    for z in range(0, 18):
+        assert clusters.get_level(z).count.sum() == 5
+        assert clusters.get_level(z).count.shape[0] <= clusters.get_level(z + 1).count.shape[0]
+
+
+def test_clustered_layer(clustered_points_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("layer_1", clustered_points_data, from_epsg=3857, cluster=True,
+                                            fill_color="red")
+    map_session.add_layers_on_maps()
+
+    layer = map_session.layers["layer_1"]
+    assert isinstance(layer, ClusteredPointLayer)
+    assert sorted(layer._data_source.data["count"].tolist()) == [2, 3]
+    assert layer._data_source.data["name"] == [None, None]
+
+    # zoom on the first group, 1 pixel per meter
+    layer._on_ranges_update(RangesUpdate(map_session.figure, x0=-10, x1=790, y0=-10, y1=590), 800)
+    assert layer._data_source.data["name"] == ["a1", "a2", "a3"]
+    assert np.all(layer._data_source.data["size"] == 8)
+
+
+def test_clustered_layer_empty(clustered_points_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("layer_1", clustered_points_data, from_epsg=3857, cluster=True)
+    map_session.add_layers_on_maps()
+
+    layer = map_session.layers["layer_1"]
+    layer.data = clustered_points_data.iloc[:0]
+    assert layer._data_source.data["count"] == []
+    assert layer._data_source.data["name"] == []
+
+
+def test_clustered_layer_empty_geometries():
+    data = gpd.GeoDataFrame({"v": [1, 2]}, geometry=[Point(), Point(1, 1)], crs="epsg:3857")
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("layer_1", data, from_epsg=3857, cluster=True)
+    layer = map_session.layers["layer_1"]
+
+    # the attributes of the point displayed
+    assert layer._data_source.data["v"] == [2]
+    assert layer.clusters.points.row.tolist() == [1]
+
+
+def test_clustered_layer_convert(clustered_points_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("layer_1", clustered_points_data, from_epsg=3857, cluster=True)
+    layer = map_session.layers["layer_1"]
+    clusters = layer.clusters
+
+    # the conversion does not touch the layer
+    layer._convert(clustered_points_data.iloc[:1])
+    assert layer.clusters is clusters
+
+    layer.data = clustered_points_data.iloc[:1]
+    assert layer.clusters is not clusters
+    assert layer.clusters.points.row.tolist() == [0]
+
+
+def test_clustered_lines_layer(linestrings_data):
+    map_session = Gdf2Bokeh()
+    with pytest.raises(Gdf2BokehError):
+        map_session.add_layer_from_geodataframe("layer_1", linestrings_data, from_epsg=4326, cluster=True)
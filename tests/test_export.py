@@ -0,0 +1,69 @@
+import pytest
+
+import geopandas as gpd
+import numpy as np
+from shapely.geometry import LineString
+
+from gdf2bokeh import Gdf2Bokeh
+from gdf2bokeh.geometry import to_typed_arrays
+
+
+@pytest.fixture
+def long_linestrings_data() -> gpd.GeoDataFrame:
+    x_values = np.linspace(0, 10, 1000)
+    return gpd.GeoDataFrame(
+        {"name": ["sin", "cos"]},
+        geometry=[LineString(zip(x_values, np.sin(x_values))), LineString(zip(x_values, np.cos(x_values)))],
+        crs="epsg:4326",
+    )
+
+
+def test_to_typed_arrays():
+    output = to_typed_arrays([[[0.0, 1.0, 1.0, 0.0]], [[1.0, 2.0]]], min_size=0)
+    assert isinstance(output[0][0], np.ndarray)
+    assert output[1][0].tolist() == [1.0, 2.0]
+
+    output = to_typed_arrays([0.0, 1.0], np.float32, min_size=0)
+    assert output.dtype == np.float32
+
+    # short lists are kept
+    output = to_typed_arrays([[0.0, 1.0], list(range(40))])
+    assert output[0] == [0.0, 1.0]
+    assert isinstance(output[1], np.ndarray)
+
+
+def test_export_html(long_linestrings_data, points_data, tmp_path):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("layer_1", long_linestrings_data, from_epsg=4326)
+    map_session.add_layer_from_geodataframe("layer_2", points_data, from_epsg=4326, size=6)
+    map_session.add_layers_on_maps()
+    json_sizes = {title: layer.data_source_size for title, layer in map_session.layers.items()}
+
+    output_path = tmp_path / "map.html"
+    sizes = map_session.export_html(str(output_path))
+
+    assert output_path.exists()
+    assert set(sizes) == {"layer_1", "layer_2"}
+    assert sizes["layer_1"] < json_sizes["layer_1"] / 2
+    lines_x = map_session.layers["layer_1"].to_binary_data_source_data()["x"]
+    assert isinstance(lines_x[0], np.ndarray)
+    assert lines_x[0].tolist() == list(map_session.layers["layer_1"].data.geometry.iloc[0].xy[0])
+    # the layers data source is kept
+    assert isinstance(map_session.layers["layer_1"]._data_source.data["x"][0], list)
+
+
+def test_export_html_quantize(long_linestrings_data, tmp_path):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("layer_1", long_linestrings_data, from_epsg=4326)
+    map_session.add_layers_on_maps()
+    layer = map_session.layers["layer_1"]
+    original_x = layer._data_source.data["x"]
+    assert layer.to_binary_data_source_data(np.float32)["x"][0].dtype == np.float32
+
+    quantized_sizes = map_session.export_html(str(tmp_path / "map.html"), quantize=True)
+    # the quantization is only applied on the export
+    assert layer._data_source.data["x"] == original_x
+    assert layer._data_source.data["x"][0] == list(layer.data.geometry.iloc[0].xy[0])
+
+    sizes = map_session.export_html(str(tmp_path / "map.html"), quantize=False)
+    assert quantized_sizes["layer_1"] < sizes["layer_1"]
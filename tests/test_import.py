@@ -0,0 +1,46 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def imported_modules(module: str) -> set[str]:
+    """To get the modules imported by a module (all of them, with -X importtime)"""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True
+    )
+    return {
+        line.split("|")[-1].strip()
+        for line in process.stderr.splitlines()
+        if line.startswith("import time:") and "cumulative" not in line
+    }
+
+
+def test_import_package_is_lazy():
+    modules = imported_modules("gdf2bokeh")
+
+    assert "gdf2bokeh" in modules
+    assert modules.isdisjoint({"geopandas", "pandas", "bokeh"})
+
+
+@pytest.mark.parametrize("module", ["gdf2bokeh.geometry", "gdf2bokeh.budget"])
+def test_import_core_without_geopandas(module):
+    modules = imported_modules(module)
+
+    assert modules.isdisjoint({"geopandas", "pandas", "bokeh"})
+
+
+def test_import_layer_without_plotting():
+    modules = imported_modules("gdf2bokeh.layer")
+
+    assert modules.isdisjoint({"geopandas", "pandas", "bokeh.plotting", "bokeh.io"})
+
+
+def test_lazy_attributes():
+    import gdf2bokeh
+    from gdf2bokeh.main import Gdf2Bokeh
+
+    assert gdf2bokeh.Gdf2Bokeh is Gdf2Bokeh
+    assert "LayerCore" in dir(gdf2bokeh)
+    with pytest.raises(AttributeError):
+        gdf2bokeh.Unknown
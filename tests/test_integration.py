@@ -1,6 +1,14 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 import geopandas as gpd
+from shapely.geometry import GeometryCollection
+from shapely.geometry import LineString
+
+from bokeh.document import Document
+from bokeh.server.callbacks import NextTickCallback
 
 from gdf2bokeh import Gdf2Bokeh
 from gdf2bokeh.layer import GeomTypeError
@@ -107,8 +115,182 @@ def test_from_mutilinestring_geom(shapely_multilinestring_without_continuity):
     assert layer.title == "layer_1"
 
 
+def test_merge_lines():
+    data = gpd.GeoDataFrame(
+        {"road": ["a", "a", "a", "b", "a"]},
+        geometry=[
+            LineString([(0, 0), (1, 0)]),
+            LineString([(1, 0), (2, 0)]),
+            # duplicated, reversed
+            LineString([(1, 0), (0, 0)]),
+            # contiguous, other attributes
+            LineString([(2, 0), (3, 0)]),
+            LineString([(5, 5), (6, 6)]),
+        ],
+        crs="epsg:3857",
+    )
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("roads", data, from_epsg=3857, merge_lines=True)
+
+    layer = map_session.layers["roads"]
+    assert layer.data["road"].tolist() == ["a", "a", "b"]
+    assert layer.data.geometry.to_wkt().tolist() == [
+        "LINESTRING (0 0, 1 0, 2 0)", "LINESTRING (5 5, 6 6)", "LINESTRING (2 0, 3 0)"
+    ]
+    assert len(layer._data_source.data["x"]) == 3
+
+
 def test_from_dummy_shapely_geom_list(shapely_point, shapely_polygon):
     map_session = Gdf2Bokeh()
     with pytest.raises(GeomTypeError):
         map_session.add_layer_from_geom_list("layer_1", [shapely_point, shapely_polygon], from_epsg=4326,
                                              geom_format="shapely")
+
+
+def test_from_mixed_geodataframe_split(mixed_features_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("layer_1", mixed_features_data, from_epsg=4326, split_geom_types=True)
+
+    layers = map_session.layers
+    assert set(layers) == {"layer_1_point", "layer_1_polygons"}
+    assert layers["layer_1_point"].data.shape[0] == 2
+    assert layers["layer_1_polygons"].data.shape[0] == 2
+    assert {layer.legend_label for layer in layers.values()} == {"layer_1"}
+
+    map_session.add_layers_on_maps()
+    assert len(map_session.figure.legend.items) == 1
+
+
+def test_from_geometry_collection_split(shapely_point, shapely_linestring, shapely_polygon):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geom_list(
+        "layer_1", [GeometryCollection([shapely_point, shapely_linestring]), shapely_polygon], from_epsg=4326,
+        geom_format="shapely", split_geom_types=True
+    )
+
+    layers = map_session.layers
+    assert set(layers) == {"layer_1_point", "layer_1_linestrings", "layer_1_polygons"}
+    # the collection parts keep the attributes of their feature
+    assert layers["layer_1_point"].data["uuid"].tolist() == [0]
+    assert layers["layer_1_linestrings"].data["uuid"].tolist() == [0]
+
+
+def test_lazy_layer(multipolygons_data, polygons_data):
+    map_session = Gdf2Bokeh(lazy=True)
+    map_session.add_layer_from_geodataframe("layer_1", multipolygons_data, from_epsg=4326)
+
+    layer = map_session.layers["layer_1"]
+    assert not layer.is_materialized
+    assert len(layer._data_source.data) == 0
+
+    # re-assigning the data before rendering does not convert anything
+    layer.data = polygons_data
+    assert not layer.is_materialized
+
+    map_session.add_layers_on_maps()
+    assert layer.is_materialized
+    assert len(layer._data_source.data["x"]) == polygons_data.shape[0]
+
+    # once rendered, the updates are applied immediately
+    layer.data = multipolygons_data
+    assert layer.is_materialized
+    assert len(layer._data_source.data["x"]) == multipolygons_data.shape[0]
+
+
+def test_lazy_layer_data_access(points_data):
+    map_session = Gdf2Bokeh(lazy=True)
+    map_session.add_layer_from_geodataframe("layer_1", points_data, from_epsg=4326)
+
+    layer = map_session.layers["layer_1"]
+    assert layer.data.crs.to_epsg() == 3857
+    assert layer.is_materialized
+
+
+def test_schedule_data_coalesce(points_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("layer_1", points_data, from_epsg=4326, size=6)
+    map_session.add_layers_on_maps()
+    document = Document()
+    document.add_root(map_session.figure)
+
+    layer = map_session.layers["layer_1"]
+    for row in reversed(range(points_data.shape[0])):
+        layer.schedule_data(points_data.iloc[:row + 1], interval=50)
+
+    # only one callback is waiting for all the updates
+    callbacks = list(document.session_callbacks)
+    assert len(callbacks) == 1
+    assert len(layer._data_source.data["x"]) == points_data.shape[0]
+
+    # the latest data only is applied
+    callbacks[0].callback()
+    assert len(layer._data_source.data["x"]) == 1
+    assert layer.data.shape[0] == 1
+
+    # the callback has been consumed, a new one is registered
+    layer.schedule_data(points_data.iloc[:1], interval=50)
+    assert list(document.session_callbacks) != callbacks
+    assert len(document.session_callbacks) == 1
+
+
+def test_schedule_data_superseded(points_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("layer_1", points_data, from_epsg=4326, size=6)
+    map_session.add_layers_on_maps()
+    document = Document()
+    document.add_root(map_session.figure)
+
+    layer = map_session.layers["layer_1"]
+    layer.schedule_data(points_data.iloc[:1], interval=50)
+    # assigned after the scheduling: the scheduled data is older
+    layer.data = points_data.iloc[:2]
+    next(iter(document.session_callbacks)).callback()
+    assert len(layer._data_source.data["x"]) == 2
+    assert layer.data.shape[0] == 2
+
+
+def test_schedule_data_executor(points_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("layer_1", points_data, from_epsg=4326, size=6)
+    map_session.add_layers_on_maps()
+    document = Document()
+    document.add_root(map_session.figure)
+
+    layer = map_session.layers["layer_1"]
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        layer.schedule_data(points_data.iloc[:1], interval=50, executor=executor)
+        next(iter(document.session_callbacks)).callback()
+    # the converted data is applied on the next tick
+    next_tick_callbacks = [
+        callback for callback in document.session_callbacks if isinstance(callback, NextTickCallback)
+    ]
+    assert len(next_tick_callbacks) == 1
+    assert len(layer._data_source.data["x"]) == points_data.shape[0]
+
+    next_tick_callbacks[0].callback()
+    assert len(layer._data_source.data["x"]) == 1
+
+
+def test_set_data_async(points_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("layer_1", points_data, from_epsg=4326, size=6)
+    layer = map_session.layers["layer_1"]
+
+    assert asyncio.run(layer.set_data_async(points_data.iloc[:1]))
+    assert len(layer._data_source.data["x"]) == 1
+    assert layer.data.shape[0] == 1
+
+
+def test_set_data_async_superseded(points_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("layer_1", points_data, from_epsg=4326, size=6)
+    layer = map_session.layers["layer_1"]
+
+    async def updates():
+        return await asyncio.gather(
+            layer.set_data_async(points_data.iloc[:1]),
+            layer.set_data_async(points_data.iloc[:2]),
+        )
+
+    assert asyncio.run(updates()) == [False, True]
+    assert len(layer._data_source.data["x"]) == 2
@@ -0,0 +1,93 @@
+import time
+
+import pytest
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from shapely.geometry import LineString
+from shapely.geometry import Point
+
+from gdf2bokeh.projection import MAX_LATITUDE
+from gdf2bokeh.projection import lonlat_to_web_mercator
+from gdf2bokeh.projection import to_web_mercator
+
+
+def assert_same_projection(data: gpd.GeoDataFrame) -> None:
+    projected = to_web_mercator(data)
+    expected = data.to_crs(epsg=3857)
+
+    assert projected.crs.to_epsg() == 3857
+    assert projected.geometry.name == data.geometry.name
+    assert (shapely.get_type_id(projected.geometry.values) == shapely.get_type_id(expected.geometry.values)).all()
+    assert np.allclose(
+        shapely.get_coordinates(projected.geometry.values), shapely.get_coordinates(expected.geometry.values),
+        rtol=0, atol=1e-6,
+    )
+    # the attributes are kept
+    assert projected.drop(columns=projected.geometry.name).equals(data.drop(columns=data.geometry.name))
+
+
+def test_lonlat_to_web_mercator():
+    x, y = lonlat_to_web_mercator(np.array([180.0, 0.0]), np.array([90.0, -90.0]))
+
+    assert x.tolist() == pytest.approx([20037508.342789244, 0])
+    # latitudes clamped on the world bounds
+    assert y.tolist() == pytest.approx([20037508.342789244, -20037508.342789244])
+    assert np.isfinite(lonlat_to_web_mercator(np.array([0.0]), np.array([MAX_LATITUDE]))[1]).all()
+
+
+@pytest.mark.parametrize("fixture", ["points_data", "multipoints_data", "linestrings_data", "multilines_data",
+                                     "polygons_data", "multipolygons_data", "mixed_features_data"])
+def test_to_web_mercator_from_wgs84(fixture, request):
+    assert_same_projection(request.getfixturevalue(fixture))
+
+
+def test_to_web_mercator_empty_geometries():
+    data = gpd.GeoDataFrame({"name": ["a", "b"]}, geometry=[Point(1, 2), Point()], crs="epsg:4326")
+
+    projected = to_web_mercator(data)
+    assert projected.geometry.iloc[1].is_empty
+    assert projected.geometry.iloc[0].x == pytest.approx(data.to_crs(epsg=3857).geometry.iloc[0].x)
+
+
+def test_to_web_mercator_other_crs(points_data):
+    web_mercator_data = points_data.to_crs(epsg=3857)
+    # identity
+    assert to_web_mercator(web_mercator_data) is web_mercator_data
+    # through pyproj
+    assert_same_projection(points_data.to_crs(epsg=2154))
+
+
+def test_to_web_mercator_z():
+    data = gpd.GeoDataFrame(
+        {"name": ["a", "b"]}, geometry=[Point(1, 2, 3), LineString([(0, 0, 1), (1, 1, 2)])], crs="epsg:4326"
+    )
+    for geometries in (data.iloc[:1], data):
+        projected = to_web_mercator(geometries)
+        expected = geometries.to_crs(epsg=3857)
+        assert shapely.has_z(projected.geometry.values).all()
+        assert np.allclose(
+            shapely.get_coordinates(projected.geometry.values, include_z=True),
+            shapely.get_coordinates(expected.geometry.values, include_z=True),
+            rtol=0, atol=1e-6,
+        )
+
+
+@pytest.mark.benchmark
+def test_to_web_mercator_speed():
+    lines = gpd.GeoDataFrame(
+        {"value": np.arange(50_000)},
+        geometry=shapely.linestrings(np.random.uniform(-50, 50, (50_000, 20, 2))),
+        crs="epsg:4326",
+    )
+
+    start = time.perf_counter()
+    lines.to_crs(epsg=3857)
+    pyproj_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    to_web_mercator(lines)
+    numpy_duration = time.perf_counter() - start
+
+    assert numpy_duration < pyproj_duration
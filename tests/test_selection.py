@@ -0,0 +1,119 @@
+import time
+
+import pytest
+
+import geopandas as gpd
+import numpy as np
+from shapely.geometry import Point
+from shapely.geometry import box
+
+from bokeh.events import SelectionGeometry
+
+from gdf2bokeh import Gdf2Bokeh
+from gdf2bokeh.layer import LayerSelectionError
+from gdf2bokeh.layer import PointLayer
+from gdf2bokeh.selection import SelectionGeometryError
+from gdf2bokeh.selection import selection_to_geometry
+
+
+@pytest.fixture
+def grid_points_data() -> gpd.GeoDataFrame:
+    # a point every 100m, on a 10x10 grid
+    x, y = np.meshgrid(np.arange(10) * 100.0, np.arange(10) * 100.0)
+    return gpd.GeoDataFrame(
+        {"name": [f"p{position}" for position in range(100)]},
+        geometry=gpd.points_from_xy(x.ravel(), y.ravel()),
+        crs="epsg:3857",
+    )
+
+
+def test_selection_to_geometry():
+    assert selection_to_geometry({"type": "rect", "x0": 10, "x1": 0, "y0": 0, "y1": 5}).equals(box(0, 0, 10, 5))
+    assert selection_to_geometry({"type": "point", "x": 1, "y": 2}).equals(Point(1, 2))
+    assert selection_to_geometry({"type": "poly", "x": [0, 1, 0], "y": [0, 0, 1]}).area == 0.5
+    # a bow-tie lasso
+    bow_tie = selection_to_geometry({"type": "poly", "x": [0, 2, 2, 0], "y": [0, 2, 0, 2]})
+    assert bow_tie.is_valid
+    assert bow_tie.area == 2
+    # degenerate lassos
+    assert selection_to_geometry({"type": "poly", "x": [0, 1], "y": [0, 0]}).is_empty
+    assert selection_to_geometry({"type": "poly", "x": [], "y": []}).is_empty
+
+    with pytest.raises(SelectionGeometryError):
+        selection_to_geometry({"type": "span"})
+
+
+def test_layer_query(grid_points_data):
+    layer = PointLayer("points", grid_points_data, from_epsg=3857, size=6)
+
+    assert layer.query(box(-1, -1, 101, 101))["name"].tolist() == ["p0", "p1", "p10", "p11"]
+    # features within 150m of a point
+    assert layer.query(Point(0, 0), distance=150)["name"].tolist() == ["p0", "p1", "p10", "p11"]
+    assert layer.query(Point(0, 0), distance=50)["name"].tolist() == ["p0"]
+
+    # the spatial index follows the data updates
+    index = layer.spatial_index
+    assert layer.spatial_index is index
+    layer.data = grid_points_data.iloc[50:]
+    assert layer.spatial_index is not index
+    assert layer.query(box(-1, -1, 101, 101)).shape[0] == 0
+
+
+def test_layer_select(grid_points_data):
+    layer = PointLayer("points", grid_points_data, from_epsg=3857, size=6)
+
+    selected = layer.select(box(850, 850, 1000, 1000))
+    assert selected["name"].tolist() == ["p99"]
+    assert layer._data_source.selected.indices == [99]
+
+
+def test_aggregated_layer_not_selectable(grid_points_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_aggregated_layer("density", grid_points_data, from_epsg=3857, cell_size=200)
+
+    with pytest.raises(LayerSelectionError):
+        map_session.layers["density"].select(box(0, 0, 100, 100))
+
+
+def test_selection_hook(grid_points_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("points", grid_points_data, from_epsg=3857, size=6)
+    map_session.add_aggregated_layer("density", grid_points_data, from_epsg=3857, cell_size=200)
+    map_session.add_layers_on_maps()
+    selections = []
+    map_session.on_selection(selections.append)
+
+    map_session.figure._trigger_event(
+        SelectionGeometry(map_session.figure, geometry={"type": "rect", "x0": -1, "x1": 101, "y0": -1, "y1": 1})
+    )
+    assert list(selections[-1]) == ["points"]
+    assert selections[-1]["points"]["name"].tolist() == ["p0", "p1"]
+
+    # a click selects the features within a few pixels
+    map_session.figure.x_range.start, map_session.figure.x_range.end = 0, 8000
+    map_session.figure._trigger_event(
+        SelectionGeometry(map_session.figure, geometry={"type": "point", "x": 420, "y": 0})
+    )
+    assert selections[-1]["points"]["name"].tolist() == ["p4"]
+
+    # a degenerate lasso clears the selection
+    map_session.figure._trigger_event(
+        SelectionGeometry(map_session.figure, geometry={"type": "poly", "x": [0, 100], "y": [0, 0]})
+    )
+    assert selections[-1]["points"].shape[0] == 0
+    assert map_session.layers["points"]._data_source.selected.indices == []
+
+
+def test_selection_speed():
+    points_count = 200_000
+    data = gpd.GeoDataFrame(
+        geometry=gpd.points_from_xy(np.random.uniform(0, 1e5, points_count), np.random.uniform(0, 1e5, points_count)),
+        crs="epsg:3857",
+    )
+    layer = PointLayer("points", data, from_epsg=3857, size=6)
+    layer.spatial_index
+
+    start = time.perf_counter()
+    rows = layer.query_rows(box(0, 0, 1e4, 1e4))
+    assert time.perf_counter() - start < 0.05
+    assert rows.shape[0] > 0
@@ -1,3 +1,8 @@
+import pytest
+import numpy as np
+from shapely.geometry import GeometryCollection
+
+from gdf2bokeh.geometry import geometries_2_bokeh_format
 from gdf2bokeh.geometry import geometry_2_bokeh_format
 
 
@@ -63,3 +68,41 @@ def test_shapely_multilinestring_geom_to_bokeh_format(shapely_multilinestring_wi
 
     output = geometry_2_bokeh_format(shapely_multilinestring_without_continuity, "y")
     assert output == [0.0, 2.0, 0.0, 10.0]
+
+
+def test_shapely_geometry_collection_geom_to_bokeh_format(shapely_linestring, shapely_polygon):
+    geometry = GeometryCollection([shapely_linestring, shapely_linestring])
+
+    # flattened as a multilinestring
+    output = geometry_2_bokeh_format(geometry, "x")
+    assert output == [0.0, 1.0, 0.0, 1.0]
+
+    output = geometry_2_bokeh_format(GeometryCollection([shapely_polygon]), "x")
+    assert output == geometry_2_bokeh_format(shapely_polygon, "x")
+
+
+def test_shapely_mixed_geometry_collection_geom_to_bokeh_format(shapely_point, shapely_linestring, shapely_polygon):
+    with pytest.raises(ValueError):
+        geometry_2_bokeh_format(GeometryCollection([shapely_point, shapely_linestring, shapely_polygon]), "x")
+
+    with pytest.raises(ValueError):
+        geometry_2_bokeh_format(GeometryCollection([shapely_point, shapely_point]), "x")
+
+
+def test_shapely_geometries_to_bokeh_format(shapely_linestring, shapely_multilinestring_without_continuity):
+    x, y, rows = geometries_2_bokeh_format(np.array([shapely_linestring, shapely_multilinestring_without_continuity]))
+
+    # single linestrings are promoted to multilinestrings, then every part gets a row
+    assert [values.tolist() for values in x] == [[0.0, 1.0], [0.0, 5.0], [6.0, 10.0]]
+    assert [values.tolist() for values in y] == [[0.0, 2.0], [0.0, 2.0], [0.0, 10.0]]
+    assert rows.tolist() == [0, 1, 1]
+
+
+def test_shapely_polygons_to_bokeh_format(shapely_polygon_with_hole):
+    x, y, rows = geometries_2_bokeh_format(np.array([shapely_polygon_with_hole]))
+
+    assert len(x) == 1 and len(x[0]) == 1
+    assert [ring.tolist() for ring in y[0][0]] == [
+        [0.0, 0.0, 10.0, 10.0, 0.0], [2.0, 2.0, 1.0, 1.0, 2.0], [9.0, 8.0, 8.0, 9.0, 9.0]
+    ]
+    assert rows.tolist() == [0]
@@ -0,0 +1,84 @@
+import pytest
+
+import geopandas as gpd
+import numpy as np
+
+from bokeh.models import CategoricalColorMapper
+from bokeh.models import GlyphRenderer
+from bokeh.models import LinearColorMapper
+
+from gdf2bokeh import Gdf2Bokeh
+from gdf2bokeh.style import StyleError
+from gdf2bokeh.style import get_palette
+
+
+@pytest.fixture
+def categorized_points_data() -> gpd.GeoDataFrame:
+    classes_count = 50
+    return gpd.GeoDataFrame(
+        {"category": [f"class_{value % classes_count:02d}" for value in range(200)], "value": np.arange(200)},
+        geometry=gpd.points_from_xy(np.arange(200), np.arange(200)),
+        crs="epsg:3857",
+    )
+
+
+def test_get_palette():
+    assert get_palette(None, 3) == ["#1f77b4", "#ff7f0e", "#2ca02c"]
+    assert len(set(get_palette(None, 50))) == 50
+    assert len(get_palette("Viridis256", 5)) == 5
+    # repeated if too short
+    assert get_palette(["red", "blue"], 3) == ["red", "blue", "red"]
+
+    with pytest.raises(StyleError):
+        get_palette("Unknown", 3)
+
+
+def test_style_by_category(categorized_points_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("points", categorized_points_data, from_epsg=3857, style_by="category",
+                                            size=6)
+    map_session.add_layers_on_maps()
+
+    renderers = [renderer for renderer in map_session.figure.renderers if isinstance(renderer, GlyphRenderer)]
+    assert len(renderers) == 1
+    fill_color = renderers[0].glyph.fill_color
+    assert isinstance(fill_color.transform, CategoricalColorMapper)
+    assert len(fill_color.transform.factors) == 50
+    # a legend item by category
+    assert map_session.figure.legend[0].items[0].label.field == "category"
+
+
+def test_style_by_value_range(categorized_points_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("points", categorized_points_data, from_epsg=3857, style_by="value",
+                                            palette="Magma256", style_range=(0, 100), size=6)
+    map_session.add_layers_on_maps()
+
+    fill_color = map_session.figure.renderers[-1].glyph.fill_color
+    assert isinstance(fill_color.transform, LinearColorMapper)
+    assert (fill_color.transform.low, fill_color.transform.high) == (0, 100)
+
+
+def test_style_by_data_update(categorized_points_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("points", categorized_points_data, from_epsg=3857, style_by="category",
+                                            line_color="black", size=6)
+    map_session.add_layers_on_maps()
+    glyph = map_session.figure.renderers[-1].glyph
+    # the explicit style parameters are kept
+    assert glyph.line_color == "black"
+
+    map_session.layers["points"].data = categorized_points_data.iloc[:3]
+    assert list(glyph.fill_color.transform.factors) == ["class_00", "class_01", "class_02"]
+
+
+def test_style_by_bool(categorized_points_data):
+    categorized_points_data["flag"] = categorized_points_data["value"] % 2 == 0
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("points", categorized_points_data, from_epsg=3857, style_by="flag", size=6)
+    map_session.add_layers_on_maps()
+
+    # the categories are converted to strings on the factors and on the data source
+    fill_color = map_session.figure.renderers[-1].glyph.fill_color
+    assert list(fill_color.transform.factors) == ["False", "True"]
+    assert map_session.layers["points"]._data_source.data["flag"][:2] == ["True", "False"]
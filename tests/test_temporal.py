@@ -0,0 +1,151 @@
+import time
+
+import pytest
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from shapely.geometry import Point
+
+from bokeh.document import Document
+from bokeh.models import Slider
+
+from gdf2bokeh import Gdf2Bokeh
+from gdf2bokeh.main import Gdf2BokehError
+from gdf2bokeh.temporal import TemporalLinestringLayer
+from gdf2bokeh.temporal import TemporalPointLayer
+
+
+@pytest.fixture
+def temporal_points_data() -> gpd.GeoDataFrame:
+    # 3 steps, unsorted
+    return gpd.GeoDataFrame(
+        {"name": ["c1", "a1", "b1", "a2", "c2"], "step": [3, 1, 2, 1, 3]},
+        geometry=[Point(0, 0), Point(1, 1), Point(2, 0), Point(3, 3), Point(4, 4)],
+        crs="epsg:3857",
+    )
+
+
+def visible_names(layer: TemporalPointLayer) -> list:
+    return layer._data_source.data["name"][layer.visible_rows]
+
+
+def test_temporal_layer_steps(temporal_points_data):
+    layer = TemporalPointLayer("points", temporal_points_data, from_epsg=3857, time_column="step", size=6)
+
+    assert layer.steps.tolist() == [1, 2, 3]
+    # the data source is sorted on the time column once
+    assert layer._data_source.data["step"] == [1, 1, 2, 3, 3]
+    assert visible_names(layer) == ["a1", "a2"]
+
+    layer.set_step(2)
+    assert layer.current_step == 2
+    assert visible_names(layer) == ["c1", "c2"]
+
+    layer.set_step(0, window=2)
+    assert visible_names(layer) == ["a1", "a2", "b1"]
+
+    layer.set_range(2, 3)
+    assert visible_names(layer) == ["b1", "c1", "c2"]
+
+
+def test_temporal_layer_tz_aware_range(temporal_points_data):
+    temporal_points_data["time"] = pd.to_datetime(temporal_points_data["step"], unit="D").dt.tz_localize("Europe/Paris")
+    layer = TemporalPointLayer("points", temporal_points_data, from_epsg=3857, time_column="time", size=6)
+
+    # naive bounds are in the time zone of the column
+    layer.set_range("1970-01-03", "1970-01-04")
+    assert visible_names(layer) == ["b1", "c1", "c2"]
+
+    layer.set_range(pd.Timestamp("1970-01-01T23:00", tz="UTC"), "1970-01-02T00:00+01:00")
+    assert visible_names(layer) == ["a1", "a2"]
+
+
+def test_temporal_layer_next_step(temporal_points_data):
+    layer = TemporalPointLayer("points", temporal_points_data, from_epsg=3857, time_column="step", size=6)
+
+    layer.set_step(2)
+    layer.next_step()
+    assert layer.current_step == 0
+
+    layer.set_step(2)
+    layer.next_step(loop=False)
+    assert layer.current_step == 2
+
+
+def test_temporal_layer_data_update(temporal_points_data):
+    layer = TemporalPointLayer("points", temporal_points_data, from_epsg=3857, time_column="step", size=6)
+    layer.set_step(2)
+
+    layer.data = temporal_points_data.loc[temporal_points_data["step"] < 3]
+    assert layer.steps.tolist() == [1, 2]
+    # the step is kept in the new steps range
+    assert layer.current_step == 1
+    assert visible_names(layer) == ["b1"]
+
+
+def test_temporal_layer_playback(temporal_points_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("points", temporal_points_data, from_epsg=3857, time_column="step",
+                                            size=6)
+    map_session.add_layers_on_maps()
+    document = Document()
+    document.add_root(map_session.figure)
+    layer = map_session.layers["points"]
+
+    layer.play(interval=50)
+    assert layer.is_playing
+    assert len(document.session_callbacks) == 1
+
+    layer.stop()
+    assert not layer.is_playing
+    assert len(document.session_callbacks) == 0
+
+
+def test_temporal_layer_slider(temporal_points_data):
+    layer = TemporalLinestringLayer(
+        "lines", temporal_points_data.set_geometry(temporal_points_data.buffer(1).boundary), from_epsg=3857,
+        time_column="step",
+    )
+
+    slider = layer.slider()
+    assert isinstance(slider, Slider)
+    assert (slider.start, slider.end, slider.value) == (0, 2, 0)
+    assert slider.js_property_callbacks["change:value"][0].args["offsets"] == [0, 2, 3, 5]
+
+    # the slider follows the steps set on the server
+    layer.set_step(1, window=2)
+    assert slider.value == 1
+    assert slider.js_property_callbacks["change:value"][0].args["window"] == 2
+    layer.next_step()
+    assert slider.value == 2
+
+    # and the layer follows the slider moved in the browser
+    slider.value = 0
+    assert layer.current_step == 0
+    assert layer.visible_rows == slice(0, 3)
+    layer.next_step()
+    assert layer.current_step == 1
+
+
+def test_temporal_layer_not_tiled(temporal_points_data):
+    with pytest.raises(Gdf2BokehError):
+        Gdf2Bokeh().add_layer_from_geodataframe("points", temporal_points_data, from_epsg=3857, time_column="step",
+                                                cluster=True)
+
+
+def test_temporal_layer_playback_speed():
+    steps_count = 1000
+    data = gpd.GeoDataFrame(
+        {"step": np.repeat(np.arange(steps_count), 100)},
+        geometry=gpd.points_from_xy(np.arange(steps_count * 100), np.arange(steps_count * 100)),
+        crs="epsg:3857",
+    )
+    layer = TemporalPointLayer("points", data, from_epsg=3857, time_column="step", size=6)
+
+    start = time.perf_counter()
+    for _ in range(steps_count):
+        layer.next_step()
+    # only the rows range is updated: far below a frame (16ms) by step
+    assert (time.perf_counter() - start) / steps_count < 0.005
+    assert layer.current_step == 0
@@ -0,0 +1,165 @@
+import os
+
+import pytest
+
+import geopandas as gpd
+from shapely.geometry import LineString
+from shapely.geometry import box
+
+from bokeh.events import RangesUpdate
+
+from gdf2bokeh import Gdf2Bokeh
+from gdf2bokeh.main import Gdf2BokehError
+from gdf2bokeh.tiles import TilePyramid
+from gdf2bokeh.tiles import TiledPolygonLayer
+from gdf2bokeh.tiles import WEB_MERCATOR_EXTENT
+from gdf2bokeh.tiles import tile_bounds
+from gdf2bokeh.tiles import zoom_for_viewport
+
+
+@pytest.fixture
+def grid_data() -> gpd.GeoDataFrame:
+    # 4 squares around the center of the world
+    return gpd.GeoDataFrame(
+        {"name": ["nw", "ne", "sw", "se"]},
+        geometry=[box(-1000, 0, -10, 1000), box(10, 0, 1000, 1000), box(-1000, -1000, -10, -10),
+                  box(10, -1000, 1000, -10)],
+        crs="epsg:3857",
+    )
+
+
+def test_tile_bounds():
+    assert tile_bounds(0, 0, 0) == (-WEB_MERCATOR_EXTENT, -WEB_MERCATOR_EXTENT,
+                                    WEB_MERCATOR_EXTENT, WEB_MERCATOR_EXTENT)
+    assert tile_bounds(1, 1, 0) == (0, 0, WEB_MERCATOR_EXTENT, WEB_MERCATOR_EXTENT)
+
+
+def test_zoom_for_viewport():
+    assert zoom_for_viewport(-WEB_MERCATOR_EXTENT, WEB_MERCATOR_EXTENT, 256) == 0
+    assert zoom_for_viewport(0, WEB_MERCATOR_EXTENT, 256) == 1
+    assert zoom_for_viewport(0, WEB_MERCATOR_EXTENT, 512) == 2
+
+
+def test_tile_pyramid(grid_data):
+    pyramid = TilePyramid(grid_data, max_zoom=2)
+    # the tiles are built when they are read
+    assert pyramid.tiles == []
+
+    assert pyramid.get_tile(0, 0, 0).shape[0] == 4
+    assert pyramid.tiles == [(0, 0, 0)]
+    # a square per quarter of the world
+    assert {(x, y): pyramid.get_tile(1, x, y)["name"].tolist() for x in range(2) for y in range(2)} == {
+        (0, 0): ["nw"], (1, 0): ["ne"], (0, 1): ["sw"], (1, 1): ["se"],
+    }
+    # the visible tiles only
+    north_east = pyramid.get_viewport(1, WEB_MERCATOR_EXTENT, 1, WEB_MERCATOR_EXTENT, 256)
+    assert north_east["name"].tolist() == ["ne"]
+
+
+def test_tile_pyramid_clip():
+    data = gpd.GeoDataFrame({"name": ["center"]}, geometry=[box(-5e6, -5e6, 5e6, 5e6)], crs="epsg:3857")
+    pyramid = TilePyramid(data, min_zoom=1, max_zoom=1)
+
+    assert pyramid.get_viewport(-WEB_MERCATOR_EXTENT, WEB_MERCATOR_EXTENT, -WEB_MERCATOR_EXTENT, WEB_MERCATOR_EXTENT,
+                                512).shape[0] == 4
+    assert len(pyramid.tiles) == 4
+    assert pyramid.get_tile(1, 1, 0).geometry.iloc[0].equals(box(0, 0, 5e6, 5e6))
+
+
+def test_tile_pyramid_on_demand():
+    # a line crossing the world diagonally: a few tiles at each zoom level only
+    data = gpd.GeoDataFrame({"name": ["diagonal"]}, geometry=[LineString([(-1e7, -1e7), (1e7, 1e7)])],
+                            crs="epsg:3857")
+    pyramid = TilePyramid(data, max_zoom=12)
+
+    # 1 pixel per 10 meters, at zoom 12
+    viewport = pyramid.get_viewport(0, 2560, 0, 2560, 256)
+    assert viewport.shape[0] == 1
+    # the part of the line on the visible tile
+    assert viewport.length.iloc[0] == pytest.approx(tile_bounds(12, 2048, 2047)[2] * 2 ** 0.5)
+    # the visible tile only is built
+    assert pyramid.tiles == [(12, 2048, 2047)]
+
+
+def test_tile_pyramid_on_disk(grid_data, tmp_path):
+    pyramid = TilePyramid(grid_data, max_zoom=1, storage_dir=str(tmp_path))
+    other_pyramid = TilePyramid(grid_data.iloc[:1], max_zoom=1, storage_dir=str(tmp_path))
+    for x in range(2):
+        for y in range(2):
+            pyramid.get_tile(1, x, y)
+            other_pyramid.get_tile(1, x, y)
+
+    # a tiles directory per pyramid, the tiles containing data are stored
+    tiles_dirs = list(tmp_path.iterdir())
+    assert len(tiles_dirs) == 2
+    assert sorted(len(list(tiles_dir.iterdir())) for tiles_dir in tiles_dirs) == [1, 4]
+    assert pyramid.get_tile(1, 1, 0)["name"].tolist() == ["ne"]
+    assert pyramid.get_tile(1, 1, 0) is pyramid.get_tile(1, 1, 0)
+    assert other_pyramid.get_tile(1, 1, 0).shape[0] == 0
+
+    # read from the disk once out of the cache
+    pyramid.get_tile.cache_clear()
+    assert pyramid.get_tile(1, 1, 0)["name"].tolist() == ["ne"]
+
+    pyramid.clear()
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_tile_pyramid_empty(grid_data):
+    pyramid = TilePyramid(grid_data.iloc[:0], max_zoom=1)
+
+    assert pyramid.tiles == []
+    assert pyramid.get_viewport(1, WEB_MERCATOR_EXTENT, 1, WEB_MERCATOR_EXTENT, 256).shape[0] == 0
+
+
+def test_tiled_layer(grid_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("layer_1", grid_data, from_epsg=3857, tiled=True, max_zoom=2)
+    map_session.add_layers_on_maps()
+
+    layer = map_session.layers["layer_1"]
+    assert isinstance(layer, TiledPolygonLayer)
+    assert len(layer._data_source.data["name"]) == 4
+
+    layer._on_ranges_update(
+        RangesUpdate(map_session.figure, x0=1, x1=WEB_MERCATOR_EXTENT, y0=1, y1=WEB_MERCATOR_EXTENT), 256
+    )
+    assert layer._data_source.data["name"] == ["ne"]
+
+
+def test_tiled_layer_convert(grid_data, tmp_path):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("layer_1", grid_data, from_epsg=3857, tiled=True, max_zoom=2,
+                                            tiles_dir=str(tmp_path))
+    layer = map_session.layers["layer_1"]
+    pyramid = layer.pyramid
+
+    # the conversion does not touch the layer: a superseded update keeps its pyramid
+    converted = layer._convert(grid_data.iloc[:1])
+    assert layer.pyramid is pyramid
+    assert len(list(tmp_path.iterdir())) == 2
+
+    # the previous pyramid is removed when the data is set
+    layer.data = grid_data.iloc[:2]
+    assert layer.pyramid is not pyramid
+    assert layer.pyramid.data.shape[0] == 2
+    assert not os.path.exists(pyramid._storage_dir)
+    converted[2]["pyramid"].clear()
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_tiled_layer_empty(grid_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("layer_1", grid_data, from_epsg=3857, tiled=True, max_zoom=2)
+    map_session.add_layers_on_maps()
+
+    layer = map_session.layers["layer_1"]
+    layer.data = grid_data.iloc[:0]
+    assert len(layer._data_source.data["name"]) == 0
+    assert layer.pyramid.tiles == []
+
+
+def test_tiled_points_layer(points_data):
+    map_session = Gdf2Bokeh()
+    with pytest.raises(Gdf2BokehError):
+        map_session.add_layer_from_geodataframe("layer_1", points_data, from_epsg=4326, tiled=True)
@@ -0,0 +1,120 @@
+import pytest
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from shapely.geometry import MultiPolygon
+from shapely.geometry import Polygon
+
+from gdf2bokeh import Gdf2Bokeh
+from gdf2bokeh import LayerBudget
+from gdf2bokeh.topology import build_topology
+
+
+@pytest.fixture
+def tessellation_data() -> gpd.GeoDataFrame:
+    # a 4x4 grid of cells with wavy shared boundaries (8 vertices by cell side)
+    cells = []
+    steps = np.arange(8) / 8
+    for i in range(4):
+        for j in range(4):
+            cells.append(Polygon(
+                [(i + step, j) for step in steps] + [(i + 1, j + step) for step in steps]
+                + [(i + 1 - step, j + 1) for step in steps] + [(i, j + 1 - step) for step in steps]
+            ))
+    cells = shapely.transform(
+        np.array(cells),
+        lambda coordinates: coordinates + 0.15 * np.column_stack(
+            [np.sin(7 * coordinates[:, 1]), np.cos(5 * coordinates[:, 0])]
+        ),
+    )
+    return gpd.GeoDataFrame({"cell": np.arange(16)}, geometry=cells, crs="epsg:3857")
+
+
+def has_gaps(geometries: np.ndarray) -> bool:
+    union = shapely.union_all(geometries)
+    return bool(shapely.get_num_interior_rings(shapely.get_parts(union)).sum() > 0) or (
+        abs(union.area - shapely.area(geometries).sum()) > 1e-9
+    )
+
+
+def test_build_topology(tessellation_data):
+    geometries = tessellation_data.geometry.values
+    topology = build_topology(geometries)
+
+    # the shared boundaries are stored once
+    assert topology.vertices_count < 0.7 * shapely.get_num_coordinates(geometries).sum()
+    rebuilt = topology.to_geometries()
+    assert shapely.equals(rebuilt, geometries).all()
+    assert (shapely.get_type_id(rebuilt) == shapely.GeometryType.POLYGON).all()
+
+
+def test_build_topology_island():
+    outer = Polygon([(0, 0), (10, 0), (10, 10), (0, 10)], [[(2, 2), (2, 8), (8, 8), (8, 2)]])
+    island = Polygon([(2, 2), (8, 2), (8, 8), (2, 8)])
+    multipolygon = MultiPolygon([Polygon([(20, 20), (21, 20), (21, 21)]), Polygon([(30, 30), (31, 30), (31, 31)])])
+    topology = build_topology(np.array([outer, island, multipolygon]))
+
+    # the hole and the island share a closed arc, read in opposite directions
+    assert topology.rings[1] == [~topology.rings[2][0]]
+    assert shapely.equals(topology.to_geometries(), [outer, island, multipolygon]).all()
+
+
+def test_topology_simplify_without_gaps(tessellation_data):
+    geometries = tessellation_data.geometry.values
+    # simplifying each polygon independently opens gaps between them
+    assert has_gaps(shapely.simplify(geometries, 0.2))
+
+    simplified = build_topology(geometries).simplify(0.2).to_geometries()
+    assert not has_gaps(simplified)
+    assert shapely.get_num_coordinates(simplified).sum() < shapely.get_num_coordinates(geometries).sum()
+
+
+def test_polygon_layer_topology(tessellation_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("cells", tessellation_data, from_epsg=3857, topology=True,
+                                            topology_tolerance=0.2)
+
+    layer = map_session.layers["cells"]
+    assert layer.topology is not None
+    assert not has_gaps(layer.data.geometry.values)
+    assert len(layer._data_source.data["x"]) == tessellation_data.shape[0]
+
+
+def test_build_topology_empty():
+    topology = build_topology(np.array([Polygon(), MultiPolygon()]))
+    assert topology.arcs == []
+
+    geometries = topology.simplify(0.2).to_geometries()
+    assert shapely.is_empty(geometries).all()
+    # the features type is kept
+    assert shapely.get_type_id(geometries).tolist() == [shapely.GeometryType.POLYGON,
+                                                         shapely.GeometryType.MULTIPOLYGON]
+
+
+def test_polygon_layer_topology_async_update(tessellation_data):
+    map_session = Gdf2Bokeh()
+    map_session.add_layer_from_geodataframe("cells", tessellation_data, from_epsg=3857, topology=True)
+    layer = map_session.layers["cells"]
+    topology = layer.topology
+
+    # the conversion does not touch the layer: the topology is set with the converted data
+    converted = layer._convert(tessellation_data.iloc[:4])
+    assert layer.topology is topology
+    assert converted[2]["topology"] is not topology
+
+    layer.data = tessellation_data.iloc[:0]
+    assert layer.topology.arcs == []
+    assert len(layer._data_source.data["x"]) == 0
+
+
+def test_polygon_layer_topology_budget(tessellation_data):
+    vertices = shapely.get_num_coordinates(tessellation_data.geometry.values).sum()
+    map_session = Gdf2Bokeh(budget=LayerBudget(max_vertices=vertices // 2, policy="simplify"))
+    map_session.add_layer_from_geodataframe("cells", tessellation_data, from_epsg=3857, topology=True)
+
+    # the budget simplifies the shared arcs
+    layer = map_session.layers["cells"]
+    assert layer.stats.vertices <= vertices // 2
+    assert not has_gaps(layer.data.geometry.values)
+    assert layer.topology.vertices_count < build_topology(tessellation_data.geometry.values).vertices_count